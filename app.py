@@ -1,120 +1,169 @@
 from __future__ import annotations
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import hashlib
+import hmac
+import json
+import os
+import base64
+import bisect
+import gzip
+import atexit
+import html as html_lib
+import importlib.util
+import math
+import mimetypes
+import queue
 import re
+import sqlite3
+import threading
+import urllib.parse
+import urllib.request
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from datetime import date, datetime
+from io import BytesIO
 from pathlib import Path
 
 
-from dash import Dash, html, dcc, Input, Output, State
+import flask
+from dash import ClientsideFunction, Dash, Patch, html, dcc, Input, Output, State
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 
+try:
+    import brotli
+except ImportError:  # без brotli отдаём только gzip
+    brotli = None
+
+try:
+    import prometheus_client as prom
+except ImportError:  # без prometheus_client нет /metrics
+    prom = None
+
+# Фазы старта, сек: импорт модуля и warm_startup(). Печатают gunicorn.conf.py
+# и benchmarks/startup.py.
+STARTUP: dict[str, float] = {}
+_phase_started = _IMPORT_STARTED
+
+
+def startup_phase(name: str) -> None:
+    global _phase_started
+    now = time.perf_counter()
+    STARTUP[name] = now - _phase_started
+    _phase_started = now
+
+
+startup_phase("imports")
+
+
+class CVDash(Dash):
+    """
+    Dash, который отдаёт /_dash-layout и index из заранее собранных байтов
+    со строгим ETag: повторный визит получает 304 без сериализации.
+    """
+
+    def _prebuilt_response(self, name: str, build, mimetype: str) -> flask.Response:
+        # layout статичен: пересобираем только при смене объекта layout, профиля, данных,
+        # даты (в layout фигура с «сейчас») или префикса URL (/en/ без cv.en.json —
+        # те же данные, но другие ссылки)
+        key = (name, id(self.layout), url_locale(), current_profile(), timeline_key())
+        entry = prebuilt_cache.get(key)
+        if entry is None or self._dev_tools.hot_reload:
+            body = build()
+            entry = (body, hashlib.sha1(body).hexdigest())
+            prebuilt_cache.put(key, entry)
+
+        body, etag = entry
+        encoding = negotiate_encoding(len(body))
+        if encoding is not None:
+            # у каждой кодировки свой ETag — иначе 304 смешает представления
+            body, etag = compress_body(body, encoding, key=etag), f"{etag}-{encoding}"
+
+        resp = flask.Response(body, mimetype=mimetype)
+        resp.set_etag(etag)
+        resp.cache_control.no_cache = True  # всегда ревалидировать по ETag
+        if len(entry[0]) >= COMPRESS_MIN_SIZE:
+            resp.vary.add("Accept-Encoding")
+        if encoding is not None:
+            resp.headers["Content-Encoding"] = encoding
+        return resp.make_conditional(flask.request)
+
+    def serve_layout(self):
+        return self._prebuilt_response(
+            "layout", lambda: super(CVDash, self).serve_layout().get_data(), "application/json"
+        )
 
-PROFILE = {
-    "name": "Крюков Александр",
-    "title": "BI / Python / SQL Lead",
-    "location": "Москва / Удаленно",
-    "email": "kryukov.av94@gmail.com",
-    "telegram": "https://t.me/kryukovav",
-    "linkedin": "linkedin.com/in/kryukovav",
-    "chat_url": "https://t.me/kryukovav",
-    "about": "Я делаю аналитику как продукт: проясняю смысл, выстраиваю процессы и помогаю людям принимать решения.",
-    "numbers": [
-        ("Опыт", "8+ лет"),
-        ("Проекты", "20+"),
-        ("Роли", "Аналитик → Лид"),
-        ("Фокус", "люди + результат"),
-    ],
-}
-
-EDUCATION = {
-    "short": "2018 • Магистр Нефтегазового дела (Транспорт и хранение нефти и газа)",
-    "details": [
-        "СпбГГУ, факультет Нефтегазовое дело",
-        "Кафедра: «Транспорт и хранение нефти и газа»",
-        "2012-2016 - Бакалавриат (Эксплуатация объектов транспорта и хранение нефти, газа и продуктов переработки)",
-        "2016-2018 - Магистратура (Диагностика газотранспортных систем)",
-    ],
-}
-
-SKILL_HINTS = {
-    "Python": "ETL/автоматизация, pandas, интеграции, Airflow, проверки качества данных, алгоритмы.",
-    "SQL": "Оптимизация запросов/процедур, витрины, качество данных, MSSQL, проектирование метрик.",
-    "Power BI": "DAX, модели, UX, drill-through, bookmarks, кастомные визуализации/HTML/SVG.",
-    "Excel": "Power Query, модели, шаблоны, сводные, аналитические справки, автоматизация.",
-}
-
-# ВАЖНО: start_date -> пропорциональная шкала
-EXPERIENCE = [
-    {
-        "id": "job3",
-        "start_date": "2022-08-01",
-        "company": "ПАО ТМК",
-        "role": "Руководитель группы",
-        "period": "Авг 2022 — по н.в.",
-        "start": "Авг 2022",
-        "tasks": [
-            "Построил систему управленческой отчётности закупок с нуля",
-            "Наполнил данными из 4 разноструктурных ERP-систем базы MS SQL и SAP BW/4HANA (100M+ строк)",
-            "Спроектировал и поддерживал ETL-процессы на Python с оркестрацией в Apache Airflow, сократив время обновления данных до 2 часов",
-            "Создал более 30 отчетов в Power BI для 1 300 пользователей: дизайн сверстал в Figma, продумал пользовательский путь, для лучшего UX использовал кастомные визуализации HTML5, SVG-графики, закладки и drill-through детализации",
-            "Создал Python-алгоритмы для автоматической проверки планов закупок (до 150 млн ₽ сокращения затрат в месяц)",
-            "Оптимизировал сложные SQL-запросы и процедуры, повысив производительность на 70%",
-            "Руководил командой из 3 аналитиков: планирование задач, code review SQL/Python, развитие компетенций",
-        ],
-        "stack": ["Python", "SQL", "MSSQL", "Power BI", "Airflow", "Figma"],
-        "skills": {"Python": 9, "SQL": 8, "Power BI": 8, "Excel": 7},
-        "x": 2022.8
-    },
-    {
-        "id": "job2",
-        "start_date": "2019-04-01",
-        "company": "АО СУЭК",
-        "role": "Главный специалист<br>→ Начальник отдела",
-        "period": "Апр 2019 — Авг 2022",
-        "start": "Апр 2019",
-        "tasks": [
-            "Формировал консолидированную отчетность на базе SAP ERP и Oracle, переносил Excel-отчеты на Power Query и Power BI",
-            "Сократил время обновления отчетности с 5 дней до 1 часа, автоматизировав ручные операции в Python",
-            "Контролировал KPI топ-менеджмента закупки: оборачиваемость запасов, сроки и объёмы поставок",
-            "Руководил аналитической группой (3 специалиста): распределение задач, контроль сроков и качества",
-        ],
-        "stack": ["Excel", "SQL", "Power BI", "Python"],
-        "skills": {"Excel": 10, "SQL": 5, "Python": 3, "Power BI": 3},
-        "x": 2019.4
-    },
-    {
-        "id": "job1",
-        "start_date": "2016-12-01",  # исправлено
-        "company": "ПАО Газпром нефть",
-        "role": "Специалист",
-        "period": "Дек 2016 — Апр 2019",
-        "start": "Дек 2016",
-        "tasks": [
-            "Выполнил более 5 тыс. заявок на аккредитацию поставщиков в SRM-системе",
-            "Формировал аналитические справки в Excel на базе выгрузок из SAP ERP (до 20 еженедельно)",
-            "Проверил более 1,5 тыс. результатов конкурсных процедур на предмет обоснованности выбора поставщиков и предложений",
-        ],
-        "stack": ["Excel", "SAP ERP"],
-        "skills": {"Excel": 4},
-        "x": 2016.12
-    },
-]
+    def index(self, *args, **kwargs):
+        return self._prebuilt_response(
+            "index", lambda: super(CVDash, self).index().encode("utf-8"), "text/html"
+        )
 
-app = Dash(
+    def _config(self):
+        config = super()._config()
+        prefix = self.config.requests_pathname_prefix
+        if url_locale() is not None:
+            prefix += f"{url_locale()}/"
+        slug = current_profile()
+        if slug is not None:
+            # layout и колбэки профиля ходят через /cv/<slug>/_dash-*
+            prefix += f"{PROFILE_PREFIX[1:]}{slug}/"
+        config["requests_pathname_prefix"] = prefix
+        return config
+
+    def interpolate_index(self, **parts):
+        if current_profile() is not None:
+            parts["title"] = f"CV {html_lib.escape(current_cv().profile.name)}"
+        if CRITICAL_PATH:
+            parts = critical_index_parts(**parts)
+        if PWA:
+            parts = pwa_index_parts(parts)
+        index = super().interpolate_index(**parts)
+        return index.replace("<html>", f'<html lang="{current_cv().locale}">', 1)
+
+    def get_asset_url(self, path: str) -> str:
+        # styles.css -> styles.<hash>.css: такие URL можно кэшировать навсегда
+        url = super().get_asset_url(path)
+        entry = None if self.config.assets_external_path else asset_manifest.entry(path)
+        if entry is None:
+            return url
+        stem, dot, ext = url.rpartition(".")
+        return f"{stem}.{entry['hash']}.{ext}" if dot and "/" not in ext else f"{url}.{entry['hash']}"
+
+
+app = CVDash(
     __name__,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
+    assets_path_ignore=["vendor", "pwa"],
     meta_tags=[{"name": "viewport", "content": "width=1024"}],
 )
 app.title = "CV Kryukov"
+startup_phase("dash app")
 
-DEFAULT_JOB = EXPERIENCE[0]["id"]
+# CV_CLIENTSIDE_JOBS=1: переключение работ целиком в браузере (assets/clientside.js),
+# Python-колбэки остаются режимом по умолчанию.
+CLIENTSIDE_JOBS = os.environ.get("CV_CLIENTSIDE_JOBS", "0") == "1"
+# CV_STATIC_EXPORT=1 (ставит export.py): работы переключаются готовыми
+# фрагментами fragments/<ревизия>/<job>.json, сервер сайту не нужен.
+STATIC_EXPORT = os.environ.get("CV_STATIC_EXPORT", "0") == "1"
+FRAGMENTS_URL = "/fragments/"
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
+def write_atomic(path: Path, data: bytes) -> None:
+    """Запись через tmp + os.replace: воркеры могут писать тот же файл, читатель не видит половину."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def parse_iso(s: str) -> date:
     return datetime.strptime(s, "%Y-%m-%d").date()
 
@@ -129,60 +178,1682 @@ def slug(s: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_-]+", "-", s.strip()).strip("-").lower()
 
 
-def find_qr_asset() -> str | None:
-    for p in ["assets/qr.png", "assets/qr.jpg", "assets/qr.jpeg"]:
-        if Path(p).exists():
-            return "/assets/" + Path(p).name
-    return None
+LRU_CACHES: dict[str, "LRUCache"] = {}  # по имени — для /metrics
+
+
+class LRUCache:
+    """Небольшой потокобезопасный LRU со счётчиками hit/miss/evict."""
+
+    def __init__(self, maxsize: int, name: str | None = None):
+        if name is not None:
+            LRU_CACHES[name] = self
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+QR_BORDER = 1  # модулей тихой зоны: рамку рисует .qr
+qr_cache = LRUCache(16, "qr")  # текст -> data URI
+
+
+def qr_svg(text: str) -> str | None:
+    """QR одним <path>: подряд идущие тёмные модули строки — один прямоугольник."""
+    try:
+        import qrcode
+    except ImportError:
+        return None
+
+    qr = qrcode.QRCode(border=QR_BORDER, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    qr.add_data(text)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    n = len(matrix)
+
+    runs = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < n:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < n and row[x]:
+                x += 1
+            runs.append(f"M{start} {y}h{x - start}v1H{start}z")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+        f'<rect width="{n}" height="{n}" fill="#fff"/><path d="{"".join(runs)}"/></svg>'
+    )
+
+
+def qr_data_uri(text: str) -> str | None:
+    """QR для контакта инлайном в layout: без отдельного запроса, строится раз на текст."""
+    if not text:
+        return None
+    uri = qr_cache.get(text)
+    if uri is None:
+        svg = qr_svg(text)
+        if svg is None:
+            return None
+        uri = "data:image/svg+xml," + urllib.parse.quote(svg, safe=" /=:;,.<>\"")
+        qr_cache.put(text, uri)
+    return uri
 
 
 def ul(items):
     return html.Ul([html.Li(x) for x in items])
 
 
-def kpi_grid():
+def kpi_grid(profile: "Profile"):
     items = []
-    for k, v in PROFILE["numbers"]:
+    for k, v in profile.numbers:
         items.append(html.Div([html.Div(k, className="k"), html.Div(v, className="v")], className="item"))
     return html.Div(items, className="kpi")
 
 RU_MON = ["Янв", "Фев", "Мар", "Апр", "Май", "Июн", "Июл", "Авг", "Сен", "Окт", "Ноя", "Дек"]
 
-def now_label_ru(d: date) -> str:
-    return f"{RU_MON[d.month - 1]} {d.year}"
+def now_label(d: date) -> str:
+    return f"{ui('months')[d.month - 1]} {d.year}"
+
+
+# ----------------------------
+# Locales
+# ----------------------------
+# CV_LOCALES=ru,en: первая — по умолчанию (cv.json), остальные берут данные
+# из cv.<locale>.json (profiles/<slug>.<locale>.json). Локаль выбирается
+# префиксом /<locale>/ или, для "/", по Accept-Language (редирект на /en/).
+# Ревизия данных у каждой локали своя, поэтому layout, фигуры и выходы
+# render_job кэшируются по локалям без отдельного ключа — запрос в любой
+# локали стоит столько же, сколько в единственной.
+LOCALES = tuple(x.strip() for x in os.environ.get("CV_LOCALES", "ru,en").split(",") if x.strip())
+DEFAULT_LOCALE = LOCALES[0]
+LOCALE_PATH_RE = re.compile(r"^/(" + "|".join(map(re.escape, LOCALES)) + r")(/.*)?$")
+
+UI_STRINGS = {
+    "ru": {
+        "months": RU_MON,
+        "career": "Карьера",
+        "duties": "Обязанности",
+        "education": "Образование",
+        "skills": "Скиллы",
+        "about": "Обо мне",
+        "contacts": "Контакты",
+        "stack": "Стек: ",
+        "print": "Версия для печати",
+        "hint_fallback": "Добавь описание навыка в skill_hints (cv.json).",
+        "job_hover": "Нажмите для отображения обязанностей",
+        "cluster": "{n} мест",
+        "cluster_hover": "{n} мест работы — приблизьте, чтобы раскрыть",
+    },
+    "en": {
+        "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+        "career": "Career",
+        "duties": "Responsibilities",
+        "education": "Education",
+        "skills": "Skills",
+        "about": "About me",
+        "contacts": "Contacts",
+        "stack": "Stack: ",
+        "print": "Printable version",
+        "hint_fallback": "Add a skill description to skill_hints (cv.en.json).",
+        "job_hover": "Click to show responsibilities",
+        "cluster": "{n} jobs",
+        "cluster_hover": "{n} jobs — zoom in to expand",
+    },
+}
+
+
+if DEFAULT_LOCALE not in UI_STRINGS:
+    raise ValueError(f"CV_LOCALES: нет строк интерфейса для {DEFAULT_LOCALE} — добавьте их в UI_STRINGS")
+_missing_ui = [locale for locale in LOCALES if locale not in UI_STRINGS]
+if _missing_ui:
+    # данные в cv.<locale>.json будут, а подписи — на языке по умолчанию
+    app.logger.warning("CV_LOCALES: no UI_STRINGS for %s, using %s", ", ".join(_missing_ui), DEFAULT_LOCALE)
+    UI_STRINGS.update({locale: UI_STRINGS[DEFAULT_LOCALE] for locale in _missing_ui})
+
+
+def ui(key: str):
+    """Строка интерфейса в локали текущих данных (вызывается только при сборке — дальше кэши)."""
+    return UI_STRINGS[current_cv().locale][key]
+
+
+def locale_data_path(path: Path, locale: str) -> Path:
+    """cv.json -> cv.en.json; для локали по умолчанию — сам файл."""
+    return path if locale == DEFAULT_LOCALE else path.with_name(f"{path.stem}.{locale}{path.suffix}")
+
+
+class LocalePathMiddleware:
+    """/<locale>/... -> /... и environ["cv.locale"]; снаружи ProfilePathMiddleware: /en/cv/<slug>/."""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        m = LOCALE_PATH_RE.match(environ.get("PATH_INFO", ""))
+        if m:
+            environ["cv.locale"] = m.group(1)
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + "/" + m.group(1)
+            environ["PATH_INFO"] = m.group(2) or "/"
+        return self.wsgi_app(environ, start_response)
+
+
+# ----------------------------
+# CV data (cv.json)
+# ----------------------------
+# Данные резюме живут в cv.json (или .yaml, если стоит PyYAML) и
+# перечитываются на лету: правка файла не требует рестарта воркеров.
+CV_DATA_PATH = Path(os.environ.get("CV_DATA", Path(__file__).with_name("cv.json")))
+CV_RELOAD_INTERVAL = float(os.environ.get("CV_RELOAD_INTERVAL", "1.0"))  # сек между stat()
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    name: str
+    title: str
+    location: str
+    email: str
+    telegram: str
+    linkedin: str
+    chat_url: str
+    about: str
+    numbers: tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Education:
+    short: str
+    details: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    id: str
+    company: str
+    role: str
+    period: str
+    start: str
+    start_date: date
+    x: float  # дробный год для пропорциональной шкалы
+    tasks: tuple[str, ...]
+    stack: tuple[str, ...]
+    skills: dict[str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class CVData:
+    profile: Profile
+    education: Education
+    skill_hints: dict[str, str]
+    jobs: tuple[Job, ...]  # порядок как в файле: сверху — последняя работа
+    by_id: dict[str, Job]
+    revision: str  # хэш содержимого файла (+ локаль, если не по умолчанию)
+    locale: str
+
+
+def _require(obj: dict, key: str, kind, where: str):
+    if key not in obj:
+        raise ValueError(f"{where}: нет обязательного поля '{key}'")
+    if not isinstance(obj[key], kind):
+        raise ValueError(f"{where}.{key}: ожидается {getattr(kind, '__name__', kind)}, получено {type(obj[key]).__name__}")
+    return obj[key]
+
+
+def _str_list(obj: dict, key: str, where: str) -> tuple[str, ...]:
+    items = _require(obj, key, list, where)
+    if not all(isinstance(x, str) for x in items):
+        raise ValueError(f"{where}.{key}: ожидается список строк")
+    return tuple(items)
+
+
+def parse_job(raw: dict, where: str) -> Job:
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where}: ожидается объект, получено {type(raw).__name__}")
+    try:
+        start_date = parse_iso(_require(raw, "start_date", str, where))
+    except ValueError as exc:
+        raise ValueError(f"{where}.start_date: {exc}") from None
+
+    skills = _require(raw, "skills", dict, where)
+    for name, level in skills.items():
+        if not isinstance(level, int) or not 0 <= level <= 10:
+            raise ValueError(f"{where}.skills.{name}: уровень должен быть целым 0..10")
+
+    x = raw.get("x", to_float_year(start_date))  # явный x — ручная подвижка точки
+    if not isinstance(x, (int, float)):
+        raise ValueError(f"{where}.x: ожидается число")
+
+    return Job(
+        id=_require(raw, "id", str, where),
+        company=_require(raw, "company", str, where),
+        role=_require(raw, "role", str, where),
+        period=_require(raw, "period", str, where),
+        start=_require(raw, "start", str, where),
+        start_date=start_date,
+        x=float(x),
+        tasks=_str_list(raw, "tasks", where),
+        stack=_str_list(raw, "stack", where),
+        skills=dict(skills),
+    )
+
+
+def parse_cv(raw: dict, revision: str, locale: str = DEFAULT_LOCALE) -> CVData:
+    """Проверка и сборка модели; ValueError с путём до проблемного поля."""
+    if not isinstance(raw, dict):
+        raise ValueError("cv: ожидается объект верхнего уровня")
+
+    p = _require(raw, "profile", dict, "profile")
+    numbers = _require(p, "numbers", list, "profile")
+    for i, pair in enumerate(numbers):
+        if not (isinstance(pair, list) and len(pair) == 2 and all(isinstance(x, (str, int, float)) for x in pair)):
+            raise ValueError(f"profile.numbers[{i}]: ожидается пара [подпись, значение]")
+    profile = Profile(
+        **{k: _require(p, k, str, "profile") for k in Profile.__slots__ if k != "numbers"},
+        numbers=tuple((str(k), str(v)) for k, v in numbers),
+    )
+    e = _require(raw, "education", dict, "education")
+    education = Education(short=_require(e, "short", str, "education"), details=_str_list(e, "details", "education"))
+
+    hints = _require(raw, "skill_hints", dict, "skill_hints")
+    if not all(isinstance(v, str) for v in hints.values()):
+        raise ValueError("skill_hints: ожидаются строки")
+    jobs = tuple(parse_job(j, f"experience[{i}]") for i, j in enumerate(_require(raw, "experience", list, "experience")))
+    if not jobs:
+        raise ValueError("experience: нужна хотя бы одна работа")
+    by_id = {j.id: j for j in jobs}
+    if len(by_id) != len(jobs):
+        raise ValueError("experience: id работ должны быть уникальны")
+
+    return CVData(
+        profile=profile, education=education, skill_hints=dict(hints), jobs=jobs, by_id=by_id,
+        revision=revision, locale=locale,
+    )
+
+
+def load_cv(path: Path, locale: str = DEFAULT_LOCALE) -> CVData:
+    raw = path.read_bytes()
+    if path.suffix in (".yaml", ".yml"):
+        import yaml  # опционально: только для YAML-файлов
+
+        doc = yaml.safe_load(raw)
+    else:
+        doc = json.loads(raw)
+    revision = hashlib.sha1(raw).hexdigest()[:12]
+    return parse_cv(doc, revision if locale == DEFAULT_LOCALE else f"{revision}-{locale}", locale)
+
+
+class CVStore:
+    """
+    Текущая модель + ленивое слежение за файлом: не чаще раза в
+    CV_RELOAD_INTERVAL делаем stat(), при изменении перечитываем и
+    подменяем модель одной ссылкой. Битый файл не роняет сайт —
+    остаётся предыдущая ревизия.
+    """
+
+    def __init__(self, path: Path, interval: float, locale: str = DEFAULT_LOCALE):
+        self.path = path
+        self.interval = interval
+        self.locale = locale
+        self._data: CVData | None = None
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> CVData:
+        now = time.monotonic()
+        if self._data is None or now - self._checked >= self.interval:
+            self._checked = now
+            self._maybe_reload()
+        return self._data
+
+    def _maybe_reload(self) -> None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            if self._data is None:
+                raise
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            try:
+                data = load_cv(self.path, self.locale)
+            except Exception as exc:  # любая ошибка правки (и yaml.YAMLError) — не повод ронять сайт
+                if self._data is None:
+                    raise
+                app.logger.warning("cv data %s not reloaded: %s", self.path, exc)
+            else:
+                self._data = data
+            self._stamp = stamp
+
+
+cv_store = CVStore(CV_DATA_PATH, CV_RELOAD_INTERVAL)
+# локали без своего файла отдают данные (и интерфейс) локали по умолчанию
+locale_stores = {
+    locale: CVStore(locale_data_path(CV_DATA_PATH, locale), CV_RELOAD_INTERVAL, locale)
+    for locale in LOCALES[1:]
+    if locale_data_path(CV_DATA_PATH, locale).is_file()
+}
+
+
+# ----------------------------
+# Profiles (/cv/<slug>)
+# ----------------------------
+# CV_PROFILES_DIR=profiles: один процесс отдаёт резюме всей команды,
+# profiles/<slug>.json открывается по /cv/<slug>. Корень "/" остаётся за CV_DATA.
+PROFILES_DIR = Path(os.environ["CV_PROFILES_DIR"]) if os.environ.get("CV_PROFILES_DIR") else None
+PROFILE_CACHE_SIZE = int(os.environ.get("CV_PROFILE_CACHE", "128"))  # профилей в памяти
+PROFILE_PREFIX = "/cv/"
+PROFILE_PATH_RE = re.compile(r"^/cv/([a-z0-9][a-z0-9_-]{0,63})(/.*)?$")
+PROFILE_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+class ProfileRegistry:
+    """
+    CVStore по slug: файл открывается на первом запросе профиля,
+    холодные профили вытесняет LRU — память не растёт с числом файлов.
+    """
+
+    def __init__(self, root: Path, size: int, interval: float):
+        self.root = root
+        self.interval = interval
+        self._stores = LRUCache(size, "profiles")
+
+    def find(self, slug: str) -> Path | None:
+        for suffix in PROFILE_SUFFIXES:
+            path = self.root / f"{slug}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def get(self, slug: str, locale: str = DEFAULT_LOCALE) -> CVStore | None:
+        store = self._stores.get((slug, locale))
+        if store is None:
+            path = self.find(slug)
+            if path is None:
+                return None
+            if locale == DEFAULT_LOCALE:
+                store = CVStore(path, self.interval)
+            else:
+                translated = self.find(f"{slug}.{locale}")
+                store = CVStore(translated, self.interval, locale) if translated else self.get(slug)
+            self._stores.put((slug, locale), store)
+        return store
+
+
+class ProfilePathMiddleware:
+    """/cv/<slug>/... -> /... и environ["cv.profile"]: маршруты Dash остаются прежними."""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        m = PROFILE_PATH_RE.match(environ.get("PATH_INFO", ""))
+        if m:
+            environ["cv.profile"] = m.group(1)
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + PROFILE_PREFIX + m.group(1)
+            environ["PATH_INFO"] = m.group(2) or "/"
+        return self.wsgi_app(environ, start_response)
+
+
+profiles = ProfileRegistry(PROFILES_DIR, PROFILE_CACHE_SIZE, CV_RELOAD_INTERVAL) if PROFILES_DIR else None
+if profiles is not None:
+    app.server.wsgi_app = ProfilePathMiddleware(app.server.wsgi_app)
+if len(LOCALES) > 1:
+    app.server.wsgi_app = LocalePathMiddleware(app.server.wsgi_app)
+
+# собранные layout/index: по два на профиль + основное резюме, на каждый префикс
+# URL — без локали и /<locale>/
+URL_PREFIXES = len(LOCALES) + 1 if len(LOCALES) > 1 else 1
+prebuilt_cache = LRUCache(URL_PREFIXES * (2 * (PROFILE_CACHE_SIZE + 1) if profiles else 8), "prebuilt")
+
+
+def current_profile() -> str | None:
+    """slug профиля текущего запроса; None — основное резюме."""
+    if profiles is None or not flask.has_request_context():
+        return None
+    return flask.request.environ.get("cv.profile")
+
+
+def current_locale() -> str:
+    """Локаль из префикса URL; без него — по умолчанию (Accept-Language только редиректит "/")."""
+    if not flask.has_request_context():
+        return DEFAULT_LOCALE
+    return flask.request.environ.get("cv.locale", DEFAULT_LOCALE)
+
 
+def url_locale() -> str | None:
+    """
+    Префикс /<locale>/ запроса как есть (None — без префикса). Данные у / и
+    /ru/ или у /en/ без cv.en.json одни, а ссылки в layout и index — разные,
+    поэтому кэши собранных страниц ключуются ещё и им.
+    """
+    if not flask.has_request_context():
+        return None
+    return flask.request.environ.get("cv.locale")
 
-def profile_hero():
-    bg_url = "url('/assets/avatar.jpg')"
+
+def current_cv() -> CVData:
+    slug, locale = current_profile(), current_locale()
+    if slug is None:
+        return locale_stores[locale].current() if locale in locale_stores else cv_store.current()
+    store = profiles.get(slug, locale)
+    if store is None:
+        flask.abort(404)
+    return store.current()
+
+
+def available_locales() -> list[str]:
+    """Локали, для которых у текущего резюме есть свой файл."""
+    slug = current_profile()
+    if slug is None:
+        return [DEFAULT_LOCALE, *locale_stores]
+    return [locale for locale in LOCALES if getattr(profiles.get(slug, locale), "locale", None) == locale]
+
+
+@app.server.before_request
+def resolve_profile():
+    if current_profile() is not None:
+        current_cv()  # неизвестный slug -> 404 до Dash, заодно загрузка данных
+
+
+if len(LOCALES) > 1:
+
+    @app.server.before_request
+    def negotiate_locale():
+        """
+        Страница без префикса локали: браузеру с другим языком — 302 на /<locale>/.
+        Дальше все URL явные, layout и колбэки идут уже с префиксом.
+        """
+        request = flask.request
+        if "cv.locale" in request.environ or request.method != "GET" or request.path != "/":
+            return None
+        locale = request.accept_languages.best_match(available_locales(), DEFAULT_LOCALE)
+        if locale == DEFAULT_LOCALE:
+            return None
+        query = request.query_string.decode("latin-1")
+        resp = flask.redirect(f"/{locale}{request.script_root}/" + (f"?{query}" if query else ""), 302)
+        resp.vary.add("Accept-Language")
+        return resp
+
+    @app.server.after_request
+    def vary_locale(resp: flask.Response) -> flask.Response:
+        if "cv.locale" not in flask.request.environ and flask.request.path == "/":
+            resp.vary.add("Accept-Language")
+        return resp
+
+
+def data_revision() -> str:
+    """Ревизия данных: меняется при любой правке cv.json."""
+    return current_cv().revision
+
+
+def resolve_job(data: CVData, job_id) -> Job:
+    """id работы от клиента (что угодно из JSON) -> работа; неизвестное — первая."""
+    return data.by_id.get(job_id, data.jobs[0]) if isinstance(job_id, str) else data.jobs[0]
+
+
+# ----------------------------
+# Metrics (/metrics)
+# ----------------------------
+# Prometheus: время и размер ответа по маршрутам и колбэкам, PreventUpdate,
+# 5xx, hit/miss/eviction LRU-кэшей (доля попаданий — hits / (hits + misses)).
+# Под gunicorn каждый воркер пишет свои значения в PROMETHEUS_MULTIPROC_DIR
+# (mmap-файлы, без общих блокировок между процессами), /metrics любого
+# воркера суммирует их — каталог готовит gunicorn.conf.py.
+METRICS_ENABLED = prom is not None and os.environ.get("CV_METRICS", "1") == "1"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(8))  # 256 Б .. 4 МБ
+CACHE_FLUSH_INTERVAL = 1.0  # сек: счётчики LRU переливаются в метрики не чаще
+
+if METRICS_ENABLED:
+    REQUEST_SECONDS = prom.Histogram(
+        "cv_request_duration_seconds", "Время обработки запроса", ["route", "callback"], buckets=LATENCY_BUCKETS
+    )
+    RESPONSE_BYTES = prom.Histogram(
+        "cv_response_bytes", "Размер тела ответа после сжатия", ["route", "callback"], buckets=SIZE_BUCKETS
+    )
+    PREVENTED = prom.Counter("cv_callback_prevent_update_total", "Колбэк не обновил выходы (204)", ["callback"])
+    ERRORS = prom.Counter("cv_request_errors_total", "Ответы 5xx", ["route", "callback"])
+    CACHE_EVENTS = prom.Counter("cv_cache_events_total", "События LRU-кэшей", ["cache", "event"])
+
+_callback_names: dict[str, str] = {}
+_cache_seen: dict[tuple[str, str], int] = {}
+_cache_flushed = 0.0
+_cache_flush_lock = threading.Lock()
+
+
+def callback_name(output) -> str:
+    # output приходит от клиента: запоминаем только существующие колбэки, иначе
+    # любой POST с новым output раздувал бы словарь воркера
+    if not isinstance(output, str):
+        return "unknown"
+    name = _callback_names.get(output)
+    if name is None:
+        entry = app.callback_map.get(output)
+        if entry is None:
+            return "unknown"
+        name = _callback_names[output] = getattr(entry.get("callback"), "__name__", "unknown")
+    return name
+
+
+def flush_cache_metrics() -> None:
+    """Приращения счётчиков LRU с прошлого сброса -> cv_cache_events_total."""
+    global _cache_flushed
+    if not _cache_flush_lock.acquire(blocking=False):
+        return  # уже сбрасывает другой поток
+    try:
+        _cache_flushed = time.monotonic()
+        for name, cache in list(LRU_CACHES.items()):
+            stats = cache.stats()
+            for event in ("hits", "misses", "evictions"):
+                delta = stats[event] - _cache_seen.get((name, event), 0)
+                if delta > 0:
+                    CACHE_EVENTS.labels(name, event).inc(delta)
+                    _cache_seen[name, event] = stats[event]
+    finally:
+        _cache_flush_lock.release()
+
+
+if METRICS_ENABLED:
+
+    @app.server.before_request
+    def start_request_timer():
+        flask.g.cv_started = time.perf_counter()
+
+    # регистрируется раньше compress_response, а Flask вызывает after_request
+    # в обратном порядке — сюда ответ приходит уже сжатым
+    @app.server.after_request
+    def record_request_metrics(resp: flask.Response) -> flask.Response:
+        started = flask.g.pop("cv_started", None)
+        if started is None or flask.request.environ.get("cv.warmup"):
+            return resp
+        elapsed = time.perf_counter() - started
+
+        rule = flask.request.url_rule
+        route = rule.rule if rule is not None else "unmatched"
+        callback = ""
+        if route.endswith("_dash-update-component"):
+            body = flask.request.get_json(silent=True)  # уже разобран Dash, из кэша
+            callback = callback_name(body.get("output") if isinstance(body, dict) else None)
+            if resp.status_code == 204:
+                PREVENTED.labels(callback).inc()
+
+        REQUEST_SECONDS.labels(route, callback).observe(elapsed)
+        RESPONSE_BYTES.labels(route, callback).observe(resp.content_length or 0)
+        if resp.status_code >= 500:
+            ERRORS.labels(route, callback).inc()
+        if time.monotonic() - _cache_flushed >= CACHE_FLUSH_INTERVAL:
+            flush_cache_metrics()
+        return resp
+
+    @app.server.route("/metrics")
+    def metrics():
+        flush_cache_metrics()
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+
+            registry = prom.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prom.REGISTRY
+        return flask.Response(prom.generate_latest(registry), mimetype=prom.CONTENT_TYPE_LATEST)
+
+
+# ----------------------------
+# Analytics (клики, визиты, время на работе)
+# ----------------------------
+# CV_ANALYTICS_DB=analytics.sqlite включает (по умолчанию выключено). Запрос
+# только кладёт событие в очередь (put_nowait), на диск пишет фоновый поток
+# пачками в одной транзакции. Переполненная очередь не тормозит ответы: новые
+# события отбрасываются и считаются (dropped, cv_analytics_events_total{result="dropped"}).
+# Сводка job_stats обновляется тем же UPSERT при каждой пачке — /analytics
+# читает её, а не сырые события; сырые хранятся CV_ANALYTICS_RETENTION_DAYS
+# (0 — только сводка). /analytics есть только с CV_ANALYTICS_TOKEN и отвечает
+# на Authorization: Bearer <токен>. Под gunicorn у каждого воркера свой поток,
+# SQLite в WAL.
+ANALYTICS_DB = os.environ.get("CV_ANALYTICS_DB", "")
+ANALYTICS_ENABLED = bool(ANALYTICS_DB) and not STATIC_EXPORT
+ANALYTICS_TOKEN = os.environ.get("CV_ANALYTICS_TOKEN", "")
+ANALYTICS_RETENTION_DAYS = float(os.environ.get("CV_ANALYTICS_RETENTION_DAYS", "30"))
+ANALYTICS_PRUNE_INTERVAL = 3600.0  # сек: удаление старых событий — не чаще
+ANALYTICS_QUEUE_SIZE = int(os.environ.get("CV_ANALYTICS_QUEUE", "10000"))  # событий в памяти
+ANALYTICS_BATCH = 500  # событий на транзакцию
+ANALYTICS_FLUSH_INTERVAL = 1.0  # сек: неполная пачка пишется не позже
+ANALYTICS_KINDS = {"select", "visit", "dwell"}
+ANALYTICS_MAX_DWELL_MS = 30 * 60 * 1000  # дольше — вкладку просто забыли
+
+ANALYTICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL, kind TEXT NOT NULL, profile TEXT NOT NULL,
+    locale TEXT NOT NULL, job TEXT NOT NULL, value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE TABLE IF NOT EXISTS job_stats (
+    profile TEXT NOT NULL, job TEXT NOT NULL, kind TEXT NOT NULL,
+    n INTEGER NOT NULL, total INTEGER NOT NULL,
+    PRIMARY KEY (profile, job, kind)
+);
+"""
+
+if METRICS_ENABLED:
+    ANALYTICS_EVENTS = prom.Counter("cv_analytics_events_total", "События аналитики", ["result"])
+
+
+class Analytics:
+    """Ограниченная очередь событий + поток, пишущий их в SQLite пачками."""
+
+    def __init__(self, path: Path, maxsize: int, batch: int, interval: float, retention_days: float):
+        self.path = path
+        self.batch = batch
+        self.interval = interval
+        self.retention = retention_days * 86400  # сек; 0 — сырые события не храним
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread: threading.Thread | None = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, job: str, value: int = 0) -> bool:
+        """Не блокирует: False — очередь полна, событие отброшено."""
+        self._ensure_writer()
+        event = (time.time(), kind, current_profile() or "", current_locale(), job, int(value))
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if METRICS_ENABLED:
+                ANALYTICS_EVENTS.labels("dropped").inc()
+            return False
+        return True
+
+    def _ensure_writer(self) -> None:
+        # поток не переживает fork: после preload в мастере воркер поднимает свой
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(self._queue.maxsize)
+                self._thread = threading.Thread(target=self._run, name="cv-analytics", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Дописать очередь при выходе процесса (atexit): поток-демон иначе просто умрёт."""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            self._queue.put(None)  # блокирующий put: остановка важнее новых событий
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        conn = self.connect()
+        conn.executescript(ANALYTICS_SCHEMA)
+        stop = False
+        pruned = 0.0
+        while not stop:
+            if self.retention and time.time() - pruned > ANALYTICS_PRUNE_INTERVAL:
+                pruned = time.time()
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM events WHERE ts < ?", (pruned - self.retention,))
+                except sqlite3.Error as exc:
+                    app.logger.warning("analytics: prune failed: %s", exc)
+            try:
+                events = [self._queue.get(timeout=self.interval)]
+            except queue.Empty:
+                continue
+            # всё, что уже накопилось, — в ту же транзакцию: при нагрузке пачки
+            # растут до ANALYTICS_BATCH, и запись догоняет очередь
+            while len(events) < self.batch:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in events:
+                stop = True
+                events = [e for e in events if e is not None]
+            try:
+                if events:
+                    self.write(conn, events)
+            except sqlite3.Error as exc:
+                app.logger.warning("analytics: %d events lost: %s", len(events), exc)
+        conn.close()
+
+    def write(self, conn: sqlite3.Connection, events: list[tuple]) -> None:
+        totals: Counter = Counter()
+        counts: Counter = Counter()
+        for _, kind, profile, _, job, value in events:
+            counts[profile, job, kind] += 1
+            totals[profile, job, kind] += value
+        with conn:
+            if self.retention:
+                conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+            conn.executemany(
+                "INSERT INTO job_stats VALUES (?, ?, ?, ?, ?) ON CONFLICT (profile, job, kind) "
+                "DO UPDATE SET n = n + excluded.n, total = total + excluded.total",
+                [(*key, n, totals[key]) for key, n in counts.items()],
+            )
+        if METRICS_ENABLED:
+            ANALYTICS_EVENTS.labels("written").inc(len(events))
+
+    def stats(self, profile: str = "") -> dict:
+        """Сводка по работам из job_stats: открытия, визиты, среднее время на работе."""
+        conn = self.connect()
+        try:
+            conn.executescript(ANALYTICS_SCHEMA)
+            rows = conn.execute("SELECT job, kind, n, total FROM job_stats WHERE profile = ?", (profile,)).fetchall()
+        finally:
+            conn.close()
+
+        jobs: dict[str, dict] = {}
+        visits = 0
+        for job, kind, n, total in rows:
+            if kind == "visit":
+                visits += n
+                continue
+            entry = jobs.setdefault(job, {"selects": 0, "dwell_count": 0, "dwell_avg_s": 0.0})
+            if kind == "select":
+                entry["selects"] = n
+            elif kind == "dwell":
+                entry["dwell_count"] = n
+                entry["dwell_avg_s"] = round(total / n / 1000, 1)
+        return {"visits": visits, "jobs": jobs, "queued": self._queue.qsize(), "dropped": self.dropped}
+
+
+analytics = (
+    Analytics(Path(ANALYTICS_DB), ANALYTICS_QUEUE_SIZE, ANALYTICS_BATCH, ANALYTICS_FLUSH_INTERVAL, ANALYTICS_RETENTION_DAYS)
+    if ANALYTICS_ENABLED else None
+)
+
+if analytics is not None:
+    atexit.register(analytics.close)
+
+    @app.server.route("/_cv-events", methods=["POST"])
+    def analytics_events():
+        """Маяки clientside.js (navigator.sendBeacon): визит, время на работе, выбор работы в клиентском режиме."""
+        try:
+            event = json.loads(flask.request.get_data())
+            kind, job, value = event["type"], event.get("job", ""), int(event.get("ms", 0))
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError):  # ms: Infinity -> OverflowError
+            flask.abort(400)
+        if not isinstance(kind, str) or kind not in ANALYTICS_KINDS:
+            flask.abort(400)
+        if kind == "visit":
+            job = ""  # визит не про работу: иначе любая строка стала бы строкой job_stats
+        elif not isinstance(job, str) or job not in current_cv().by_id:
+            flask.abort(400)
+        analytics.record(kind, job, max(0, min(value, ANALYTICS_MAX_DWELL_MS)))
+        return "", 204
+
+if analytics is not None and ANALYTICS_TOKEN:
+
+    @app.server.route("/analytics")
+    def analytics_view():
+        """Сводка поведения посетителей — только владельцу (Bearer-токен), не всем."""
+        auth = flask.request.authorization
+        token = auth.token if auth is not None and auth.type == "bearer" else None
+        if token is None or not hmac.compare_digest(token.encode("utf-8"), ANALYTICS_TOKEN.encode("utf-8")):
+            resp = flask.Response(status=401)
+            resp.www_authenticate.type = "bearer"
+            return resp
+        resp = flask.jsonify(analytics.stats(current_profile() or ""))
+        resp.cache_control.private = True
+        resp.cache_control.no_store = True
+        return resp
+
+
+# ----------------------------
+# Static assets
+# ----------------------------
+ASSET_CACHE_DIR = Path(".asset-cache")  # gzip/brotli-копии текстовых ассетов
+ASSET_TEXT_EXTS = {".css", ".js", ".json", ".svg", ".txt", ".html"}
+ASSET_IMMUTABLE = "public, max-age=31536000, immutable"
+ASSET_HASHED_RE = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{10})(?P<ext>\.[A-Za-z0-9]+)?$")
+
+
+COMPRESSORS = {  # в порядке предпочтения при согласовании Accept-Encoding
+    **({"br": lambda data, level: brotli.compress(data, quality=level)} if brotli is not None else {}),
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+}
+ASSET_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+ASSET_LEVELS = {"br": 11, "gzip": 9}  # статика сжимается один раз — можно по максимуму
+
+
+class AssetManifest:
+    """
+    Отпечатки файлов из assets/ по содержимому. Считаются лениво и
+    пересчитываются только если у файла сменились mtime/размер; для
+    текстовых файлов рядом в ASSET_CACHE_DIR лежат сжатые копии.
+    """
+
+    def __init__(self, root: Path, cache_dir: Path):
+        self.root = root
+        self.cache_dir = cache_dir
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def entry(self, rel: str) -> dict | None:
+        full = self.root / rel
+        try:
+            st = full.stat()
+        except OSError:
+            return None
+        if not full.is_file() or not full.resolve().is_relative_to(self.root.resolve()):
+            return None
+
+        entry = self._entries.get(rel)
+        if entry is not None and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry
+
+        with self._lock:
+            data = full.read_bytes()
+            digest = hashlib.sha1(data).hexdigest()[:10]
+            entry = {
+                "path": full,
+                "mtime": st.st_mtime_ns,
+                "size": st.st_size,
+                "hash": digest,
+                "mimetype": mimetypes.guess_type(full.name)[0] or "application/octet-stream",
+                "encoded": self._precompress(full, digest, data) if full.suffix in ASSET_TEXT_EXTS else {},
+            }
+            self._entries[rel] = entry
+        return entry
+
+    def _precompress(self, full: Path, digest: str, data: bytes) -> dict[str, Path]:
+        encoded = {}
+        for name, compress in COMPRESSORS.items():
+            out = self.cache_dir / f"{full.stem}.{digest}{full.suffix}{ASSET_SUFFIXES[name]}"
+            if not out.exists():
+                write_atomic(out, compress(data, ASSET_LEVELS[name]))
+            if out.stat().st_size < len(data):
+                encoded[name] = out
+        return encoded
+
+
+asset_manifest = AssetManifest(Path("assets"), ASSET_CACHE_DIR)
+
+
+def send_asset(entry: dict, immutable: bool) -> flask.Response:
+    """Файл (или его gzip/br-копия по Accept-Encoding) с нужными заголовками."""
+    path, encoding = entry["path"], None
+    accepted = flask.request.accept_encodings
+    for name in COMPRESSORS:
+        if name in entry["encoded"] and accepted[name]:
+            path, encoding = entry["encoded"][name], name
+            break
+
+    resp = flask.send_file(path, mimetype=entry["mimetype"], conditional=True, etag=False)
+    resp.set_etag(entry["hash"] + (f"-{encoding}" if encoding else ""))
+    resp = resp.make_conditional(flask.request)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if entry["encoded"]:
+        resp.vary.add("Accept-Encoding")
+    if immutable:
+        resp.headers["Cache-Control"] = ASSET_IMMUTABLE
+    else:
+        resp.cache_control.no_cache = True
+    return resp
+
+
+@app.server.before_request
+def serve_hashed_asset():
+    """
+    /assets/styles.<hash>.css -> assets/styles.css с immutable-кэшем.
+    Обычные /assets/... тоже получают сжатые копии, но ревалидируются.
+    """
+    prefix = app.config.routes_pathname_prefix + app.config.assets_url_path.lstrip("/") + "/"
+    path = flask.request.path
+    if not path.startswith(prefix):
+        return None
+
+    rel = path[len(prefix):]
+    m = ASSET_HASHED_RE.match(rel)
+    if m:
+        entry = asset_manifest.entry(m["stem"] + (m["ext"] or ""))
+        if entry is not None:
+            # устаревший хэш (файл уже поменяли) — отдаём свежий, но без immutable
+            return send_asset(entry, immutable=entry["hash"] == m["hash"])
+
+    entry = asset_manifest.entry(rel)
+    return send_asset(entry, immutable=False) if entry is not None else None
+
+
+# ----------------------------
+# Response compression
+# ----------------------------
+COMPRESS_MIN_SIZE = int(os.environ.get("CV_COMPRESS_MIN_SIZE", "1024"))  # байт
+COMPRESS_LEVELS = {
+    "br": int(os.environ.get("CV_BROTLI_LEVEL", "5")),
+    "gzip": int(os.environ.get("CV_GZIP_LEVEL", "6")),
+}
+COMPRESS_ENDPOINTS = {"_dash-layout", "_dash-dependencies", "_dash-update-component", "", "<path:path>"}
+COMPRESSED_CACHE_SIZE = 256
+
+compressed_cache = LRUCache(COMPRESSED_CACHE_SIZE, "compressed")  # (sha1 тела, кодировка) -> байты
+
+
+def negotiate_encoding(size: int) -> str | None:
+    if size < COMPRESS_MIN_SIZE:
+        return None
+    accepted = flask.request.accept_encodings
+    return next((name for name in COMPRESSORS if accepted[name]), None)
+
+
+def compress_body(data: bytes, encoding: str, key: str | None = None) -> bytes:
+    """
+    Сжатие с кэшем: горячие ответы (layout, закэшированные render_job)
+    повторяются байт-в-байт, поэтому второй раз их не жмём.
+    """
+    cache_key = (key or hashlib.sha1(data).hexdigest(), encoding)
+    body = compressed_cache.get(cache_key)
+    if body is None:
+        body = COMPRESSORS[encoding](data, COMPRESS_LEVELS[encoding])
+        compressed_cache.put(cache_key, body)
+    return body
+
+
+@app.server.after_request
+def compress_response(resp: flask.Response) -> flask.Response:
+    prefix = app.config.routes_pathname_prefix
+    endpoint = flask.request.endpoint or ""
+    if (
+        not endpoint.startswith(prefix)
+        or endpoint[len(prefix):] not in COMPRESS_ENDPOINTS
+        or resp.status_code != 200
+        or resp.direct_passthrough
+        or "Content-Encoding" in resp.headers
+    ):
+        return resp
+
+    data = resp.get_data()
+    if len(data) >= COMPRESS_MIN_SIZE:
+        resp.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(len(data))
+    if encoding is None:
+        return resp
+
+    resp.set_data(compress_body(data, encoding))
+    resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+# ----------------------------
+# Avatar pipeline
+# ----------------------------
+AVATAR_SRC = Path("assets/avatar.jpg")
+AVATAR_DIR = Path("assets/img")  # генерируется, в git не хранится
+AVATAR_WIDTHS = (400, 800, 1200)  # 1x / 2x / 3x для колонки ~390px
+AVATAR_SIZES = "(min-width: 1200px) 400px, 34vw"
+AVATAR_FORMATS = (  # от лучшего сжатия к самому совместимому
+    ("avif", "AVIF", "image/avif", {"quality": 50}),
+    ("webp", "WEBP", "image/webp", {"quality": 78, "method": 6}),
+    ("jpg", "JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+
+def _save_atomic(im, path: Path, fmt: str, opts: dict) -> None:
+    buf = BytesIO()
+    im.save(buf, fmt, **opts)
+    write_atomic(path, buf.getvalue())
+
+
+def build_avatar_variants(src: Path = AVATAR_SRC, out_dir: Path = AVATAR_DIR) -> dict | None:
+    """
+    Ресайз аватара в AVIF/WebP/JPEG по AVATAR_WIDTHS + крошечная размытая
+    заглушка. Файлы названы по хэшу исходника, так что пересборка идёт
+    только когда меняется сам avatar.jpg.
+    """
+    if not src.exists():
+        return None
+
+    digest = hashlib.sha1(src.read_bytes()).hexdigest()[:10]
+    manifest_path = out_dir / f"avatar.{digest}.json"
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    from PIL import Image, ImageFilter, ImageOps
+
+    srcsets: dict[str, list[str]] = {mime: [] for _, _, mime, _ in AVATAR_FORMATS}
+    with Image.open(src) as raw:
+        im = ImageOps.exif_transpose(raw).convert("RGB")
+
+    for w in AVATAR_WIDTHS:
+        w = min(w, im.width)
+        resized = im.resize((w, round(im.height * w / im.width)), Image.LANCZOS)
+        for ext, fmt, mime, opts in AVATAR_FORMATS:
+            name = f"avatar.{digest}.{w}.{ext}"
+            _save_atomic(resized, out_dir / name, fmt, opts)
+            srcsets[mime].append(f"{name} {w}w")
+
+    tiny = im.resize((16, round(im.height * 16 / im.width)), Image.LANCZOS).filter(ImageFilter.GaussianBlur(1))
+    buf = BytesIO()
+    tiny.save(buf, "JPEG", quality=40)
+
+    manifest = {
+        "sources": [{"type": mime, "srcset": srcsets[mime]} for _, _, mime, _ in AVATAR_FORMATS],
+        "fallback": f"avatar.{digest}.{min(AVATAR_WIDTHS[1], im.width)}.jpg",
+        "placeholder": "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii"),
+    }
+    write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+
+    # варианты от прошлых версий аватара больше не нужны
+    for p in out_dir.glob("avatar.*"):
+        if digest not in p.name:
+            p.unlink(missing_ok=True)
+    return manifest
+
+
+def avatar_urls() -> dict | None:
+    """Манифест аватара с уже готовыми (отпечатанными) URL."""
+    if current_profile() is not None:
+        return None  # фото основного резюме на чужих профилях не показываем
+    avatar = build_avatar_variants()
+    if avatar is None:
+        return None
+
+    def url(name):
+        return app.get_asset_url(f"{AVATAR_DIR.name}/{name}")
+
+    return {
+        "sources": [
+            {"type": s["type"], "srcset": ", ".join(url(name) + " " + w for name, w in (x.split(" ") for x in s["srcset"]))}
+            for s in avatar["sources"]
+        ],
+        "fallback": url(avatar["fallback"]),
+        "placeholder": avatar["placeholder"],
+    }
+
+
+def profile_media(profile: "Profile"):
+    avatar = avatar_urls()
+    if avatar is None:
+        if current_profile() is not None:
+            return html.Div(className="profile-media")
+        return html.Div(className="profile-media", style={"backgroundImage": "url('/assets/avatar.jpg')"})
+
+    # <picture> выбирает формат и ширину по вьюпорту и DPR, заглушка — фон
+    return html.Picture(
+        [html.Source(type=s["type"], srcSet=s["srcset"], sizes=AVATAR_SIZES) for s in avatar["sources"]]
+        + [html.Img(src=avatar["fallback"], alt=profile.name)],
+        className="profile-media",
+        style={"backgroundImage": f"url('{avatar['placeholder']}')"},
+    )
+
+
+def profile_hero(profile: "Profile"):
     return html.Div(
         className="profile-hero cardx",
         children=[
-            html.Div(className="profile-media", style={"backgroundImage": bg_url}),
+            profile_media(profile),
             html.Div(
                 className="profile-footer",
                 children=[
-                    html.Div(PROFILE["name"], className="profile-name"),
-                    html.Div(PROFILE["title"], className="profile-role"),
+                    html.Div(profile.name, className="profile-name"),
+                    html.Div(profile.title, className="profile-role"),
                 ],
             ),
         ],
     )
 
 
+# ----------------------------
+# Critical render path
+# ----------------------------
+# CV_CRITICAL_PATH=1: критический CSS инлайном, preload аватара, Bootstrap
+# со своего домена, defer для скриптов и HTML-каркас героя до старта React.
+CRITICAL_PATH = os.environ.get("CV_CRITICAL_PATH", "0") == "1"
+VENDOR_DIR = Path("assets/vendor")  # CDN-стили, скачанные vendor.py; Dash их сам не подключает
+FONT_PRELOADS: tuple[str, ...] = ()  # пути woff2 в assets/; сейчас шрифты системные
+CRITICAL_SELECTORS = (
+    ":root", "body", ".page-wrap", ".col-flex", ".cardx", ".h-title", ".section-title", ".muted",
+    ".kpi", ".profile-", ".about-eq", ".right-grid", ".timeline-card", ".job-card", ".scrollbox",
+)
+# Минимум Bootstrap для сетки первого экрана — полный файл догрузится следом
+BOOTSTRAP_CRITICAL = (
+    "*,::after,::before{box-sizing:border-box}"
+    "body{margin:0;font-size:1rem;line-height:1.5;-webkit-text-size-adjust:100%}"
+    ".row{display:flex;flex-wrap:wrap;margin-top:calc(-1 * var(--bs-gutter-y));"
+    "margin-right:calc(-.5 * var(--bs-gutter-x));margin-left:calc(-.5 * var(--bs-gutter-x))}"
+    ".row>*{flex-shrink:0;width:100%;max-width:100%;padding-right:calc(var(--bs-gutter-x) * .5);"
+    "padding-left:calc(var(--bs-gutter-x) * .5);margin-top:var(--bs-gutter-y)}"
+    ".g-0{--bs-gutter-x:0;--bs-gutter-y:0}"
+    ".col-4{flex:0 0 auto;width:33.33333333%}.col-12{flex:0 0 auto;width:100%}"
+    "@media (min-width:992px){.col-lg-8{flex:0 0 auto;width:66.66666667%}}"
+)
+
+
+def vendor_path(url: str) -> Path:
+    name = re.sub(r"[^A-Za-z0-9._@-]+", "_", url.split("//", 1)[1].split("/", 1)[-1])
+    return VENDOR_DIR / name
+
+
+def external_stylesheets() -> list[str]:
+    urls = [s if isinstance(s, str) else s.get("href", "") for s in app.config.external_stylesheets]
+    return [u for u in urls if u.startswith(("http://", "https://"))]
+
+
+def fetch_vendor_styles() -> list[Path]:
+    """Шаг сборки (python vendor.py): внешние стили -> assets/vendor. Без сети — исключение."""
+    paths = []
+    for url in external_stylesheets():
+        with urllib.request.urlopen(url, timeout=30) as r:
+            write_atomic(vendor_path(url), r.read())
+        paths.append(vendor_path(url))
+    return paths
+
+
+def vendor_stylesheet(url: str) -> str:
+    """Внешний стиль -> его копия в assets/vendor, если она есть; в запросе сети нет."""
+    if not url.startswith(("http://", "https://")):
+        return url
+    path = vendor_path(url)
+    return app.get_asset_url(f"{VENDOR_DIR.name}/{path.name}") if path.is_file() else url
+
+
+def extract_css_rules(css: str, prefixes: tuple[str, ...]) -> str:
+    """Правила верхнего уровня, хотя бы один селектор которых начинается с prefixes."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    rules, pos = [], 0
+    while (start := css.find("{", pos)) != -1:
+        depth, end = 0, start
+        for end in range(start, len(css)):
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            if depth == 0:
+                break
+        selector = css[pos:start].strip()
+        if not selector.startswith("@") and any(x.strip().startswith(prefixes) for x in selector.split(",")):
+            rules.append(selector + css[start:end + 1])
+        pos = end + 1
+    return re.sub(r"\s+", " ", "".join(rules))
+
+
+def hero_shell(avatar: dict | None) -> str:
+    """Статический HTML героя внутри react-entry-point: виден до загрузки JS."""
+    e = html_lib.escape
+    profile = current_cv().profile
+    if avatar is None:
+        media = '<div class="profile-media"></div>'
+    else:
+        sources = "".join(
+            f'<source type="{s["type"]}" srcset="{e(s["srcset"])}" sizes="{AVATAR_SIZES}">' for s in avatar["sources"]
+        )
+        media = (
+            f'<picture class="profile-media" style="background-image:url({avatar["placeholder"]})">'
+            f'{sources}<img src="{e(avatar["fallback"])}" alt="{e(profile.name)}"></picture>'
+        )
+    return (
+        '<div id="react-entry-point"><div class="page-wrap">'
+        '<div class="row g-0" style="--bs-gutter-x:12px;--bs-gutter-y:12px"><div class="col-4">'
+        f'<div class="col-flex"><div class="profile-hero cardx">{media}'
+        f'<div class="profile-footer"><div class="profile-name">{e(profile.name)}</div>'
+        f'<div class="profile-role">{e(profile.title)}</div></div>'
+        "</div></div></div></div></div></div>"
+    )
+
+
+if CRITICAL_PATH:
+    _unvendored = [url for url in external_stylesheets() if not vendor_path(url).is_file()]
+    if _unvendored:
+        app.logger.warning(
+            "CV_CRITICAL_PATH: %s not in %s (run `python vendor.py`), serving from CDN",
+            ", ".join(_unvendored), VENDOR_DIR,
+        )
+
+
+def critical_index_parts(css: str, scripts: str, renderer: str, app_entry: str, **parts) -> dict:
+    hrefs = [vendor_stylesheet(html_lib.unescape(h)) for h in re.findall(r'<link[^>]*href="([^"]+)"', css)]
+    styles = asset_manifest.entry("styles.css")
+    inline = BOOTSTRAP_CRITICAL + (
+        extract_css_rules(styles["path"].read_text(encoding="utf-8"), CRITICAL_SELECTORS) if styles else ""
+    )
+
+    avatar = avatar_urls()
+    head = [f"<style>{inline}</style>"]
+    if avatar is not None:
+        best = avatar["sources"][0]
+        head.append(
+            f'<link rel="preload" as="image" type="{best["type"]}" imagesrcset="{html_lib.escape(best["srcset"])}" '
+            f'imagesizes="{AVATAR_SIZES}" fetchpriority="high">'
+        )
+    head += [
+        f'<link rel="preload" as="font" type="font/woff2" href="{app.get_asset_url(f)}" crossorigin>'
+        for f in FONT_PRELOADS
+    ]
+    # полные стили — без блокировки отрисовки, порядок каскада сохраняется
+    head += [
+        f'<link rel="preload" as="style" href="{html_lib.escape(h)}" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        for h in hrefs
+    ]
+    head.append("<noscript>" + "".join(f'<link rel="stylesheet" href="{html_lib.escape(h)}">' for h in hrefs) + "</noscript>")
+
+    return dict(
+        parts,
+        css="\n".join(head),
+        scripts=scripts.replace("<script src=", "<script defer src="),
+        # defer-скрипты выполняются до DOMContentLoaded — рендерер стартует после них
+        renderer=renderer.replace(app.renderer, f'document.addEventListener("DOMContentLoaded", function () {{ {app.renderer} }});'),
+        app_entry=hero_shell(avatar),
+    )
+
+
+# ----------------------------
+# PWA (manifest + service worker)
+# ----------------------------
+# CV_PWA=1: <prefix>manifest.webmanifest и <prefix>sw.js. Service worker
+# (assets/pwa/sw.js) держит каркас, ассеты и ответы render_job в кэше,
+# названном по ревизии данных — после первого визита резюме открывается
+# из кэша и работает офлайн.
+PWA = os.environ.get("CV_PWA", "0") == "1"
+PWA_SW_TEMPLATE = Path("assets/pwa/sw.js")
+PWA_ICON_SIZES = (192, 512)
+PWA_THEME_COLOR = "#f5f6fa"  # --bg из styles.css
+
+
+def build_pwa_icons(src: Path = AVATAR_SRC, out_dir: Path = AVATAR_DIR) -> list[str] | None:
+    """Квадратные PNG-иконки из аватара (центр кадра), по хэшу исходника — как варианты аватара."""
+    if not src.exists():
+        return None
+
+    digest = hashlib.sha1(src.read_bytes()).hexdigest()[:10]
+    names = [f"icon.{digest}.{size}.png" for size in PWA_ICON_SIZES]
+    if all((out_dir / name).exists() for name in names):
+        return names
+
+    from PIL import Image, ImageOps
+
+    with Image.open(src) as raw:
+        im = ImageOps.exif_transpose(raw).convert("RGB")
+    for size, name in zip(PWA_ICON_SIZES, names):
+        icon = ImageOps.fit(im, (size, size), Image.LANCZOS, centering=(0.5, 0.35))
+        _save_atomic(icon, out_dir / name, "PNG", {"optimize": True})
+
+    for p in out_dir.glob("icon.*"):
+        if digest not in p.name:
+            p.unlink(missing_ok=True)
+    return names
+
+
+def pwa_prefix() -> str:
+    return app._config()["requests_pathname_prefix"]
+
+
+def pwa_manifest() -> bytes:
+    profile = current_cv().profile
+    prefix = pwa_prefix()
+    # у чужих профилей фото основного резюме не показываем (как avatar_urls)
+    icons = build_pwa_icons() if current_profile() is None else None
+    manifest = {
+        "name": app.title if current_profile() is None else f"CV {profile.name}",
+        "short_name": profile.name,
+        "description": profile.title,
+        "lang": current_cv().locale,
+        "start_url": prefix,
+        "scope": prefix,
+        "display": "standalone",
+        "background_color": PWA_THEME_COLOR,
+        "theme_color": PWA_THEME_COLOR,
+        "icons": [
+            {"src": app.get_asset_url(f"{AVATAR_DIR.name}/{name}"), "sizes": f"{size}x{size}", "type": "image/png"}
+            for size, name in zip(PWA_ICON_SIZES, icons or ())
+        ],
+    }
+    return json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+
+
+def pwa_service_worker() -> bytes:
+    """sw.js с конфигом: имя кэша по ревизии и список каркаса из текущего index."""
+    prefix = pwa_prefix()
+    index = Dash.index(app)
+    shell = [prefix, f"{prefix}_dash-layout", f"{prefix}_dash-dependencies", f"{prefix}manifest.webmanifest"]
+    for url in re.findall(r'(?:src|href)="([^"]+)"', index):
+        url = html_lib.unescape(url)
+        if not url.startswith("data:") and url not in shell:
+            shell.append(url)
+
+    # имя кэша — данные + код/ассеты (отпечатки в списке каркаса) + сам воркер:
+    # деплой без правки cv.json тоже даёт новый кэш, старый удалится при активации
+    build = hashlib.sha1(json.dumps(shell).encode("utf-8") + PWA_SW_TEMPLATE.read_bytes()).hexdigest()[:10]
+    scope = f"cv:{prefix}:"
+    config = {"cache": f"{scope}{data_revision()}:{build}", "scope": scope, "prefix": prefix, "precache": shell}
+    return f"self.CV = {json.dumps(config)};\n".encode("utf-8") + PWA_SW_TEMPLATE.read_bytes()
+
+
+def pwa_index_parts(parts: dict) -> dict:
+    prefix = pwa_prefix()
+    metas = (
+        f'<link rel="manifest" href="{prefix}manifest.webmanifest">'
+        f'<meta name="theme-color" content="{PWA_THEME_COLOR}">'
+    )
+    # после активации воркеру уходят URL всего, что страница уже загрузила
+    register = (
+        '<script>if ("serviceWorker" in navigator) { window.addEventListener("load", function () { '
+        f'navigator.serviceWorker.register("{prefix}sw.js"); '
+        "navigator.serviceWorker.ready.then(function (reg) { new PerformanceObserver(function (list) { "
+        'var urls = list.getEntries().filter(function (e) { return /^(script|link|img|css)$/.test(e.initiatorType); })'
+        ".map(function (e) { return e.name; }); if (urls.length) { reg.active.postMessage({cache: urls}); } })"
+        '.observe({type: "resource", buffered: true}); }); }); }</script>'
+    )
+    return dict(parts, metas=parts["metas"] + metas, renderer=parts["renderer"] + register)
+
+
+if PWA:
+
+    @app.server.route("/manifest.webmanifest")
+    def web_manifest():
+        return app._prebuilt_response("manifest", pwa_manifest, "application/manifest+json")
+
+    @app.server.route("/sw.js")
+    def service_worker():
+        # scope — каталог sw.js: "/" или /cv/<slug>/ у профиля
+        return app._prebuilt_response("sw", pwa_service_worker, "text/javascript")
+
+
+# ----------------------------
+# Print / PDF (/cv.pdf, /print.html)
+# ----------------------------
+# Резюме для рекрутеров: <prefix>cv.pdf (fpdf2) и <prefix>print.html — HTML под
+# печать, все работы с раскрытыми обязанностями. Файл собирается один раз
+# на ревизию данных и лежит в PRINT_DIR; дальше запросы — только отдача
+# файла (ETag/Last-Modified, 304, Range). Профили и локали — через те же
+# префиксы URL, у каждой своя ревизия и свой файл.
+PRINT_DIR = Path(".print-cache")
+PRINT_VERSION = 1  # в имени файла: правка шаблона/вёрстки PDF -> новые файлы
+PRINT_KEEP = int(os.environ.get("CV_PRINT_KEEP", "64"))  # файлов в PRINT_DIR, старые удаляются
+# встроенные шрифты PDF не знают кириллицы — нужен TTF. Ищем DejaVu в
+# assets/fonts/ (можно положить рядом с кодом), затем там, куда его ставят
+# пакеты Debian/Ubuntu, Fedora/RHEL, Arch; CV_PDF_FONT(_BOLD) — явный путь.
+PDF_FONT_DIRS = (
+    Path("assets/fonts"),
+    Path("/usr/share/fonts/truetype/dejavu"),
+    Path("/usr/share/fonts/dejavu-sans-fonts"),
+    Path("/usr/share/fonts/TTF"),
+)
+
+
+def find_font(env: str, name: str) -> Path | None:
+    if os.environ.get(env):
+        return Path(os.environ[env])
+    return next((d / name for d in PDF_FONT_DIRS if (d / name).is_file()), None)
+
+
+PDF_FONT = find_font("CV_PDF_FONT", "DejaVuSans.ttf")
+PDF_FONT_BOLD = find_font("CV_PDF_FONT_BOLD", "DejaVuSans-Bold.ttf")
+if importlib.util.find_spec("fpdf") is None:
+    PDF_ENABLED = False
+    app.logger.warning("/cv.pdf disabled: fpdf2 is not installed")
+elif not all(font is not None and font.is_file() for font in (PDF_FONT, PDF_FONT_BOLD)):
+    PDF_ENABLED = False
+    app.logger.warning(
+        "/cv.pdf disabled: DejaVuSans.ttf / DejaVuSans-Bold.ttf not found in %s (set CV_PDF_FONT, CV_PDF_FONT_BOLD)",
+        ", ".join(map(str, PDF_FONT_DIRS)),
+    )
+else:
+    PDF_ENABLED = True
+
+PRINT_CSS = """
+@page { size: A4; margin: 16mm 18mm; }
+body { font: 10.5pt/1.45 "DejaVu Sans", Arial, sans-serif; color: #111827; margin: 0 auto; max-width: 180mm; }
+h1 { font-size: 20pt; margin: 0; }
+h2 { font-size: 12pt; margin: 16pt 0 6pt; padding-bottom: 2pt; border-bottom: 1px solid #d1d5db; text-transform: uppercase; letter-spacing: .04em; }
+h3 { font-size: 11pt; margin: 0; }
+ul { margin: 4pt 0 0; padding-left: 14pt; }
+.muted { color: #6b7280; }
+.kpi { display: flex; gap: 14pt; margin-top: 8pt; }
+.kpi b { display: block; }
+.job { margin-top: 10pt; break-inside: avoid; }
+.job .head { display: flex; justify-content: space-between; gap: 12pt; }
+@media screen { body { padding: 24px; } }
+"""
+
+
+def print_role(job: Job) -> str:
+    # role может содержать <br> для подсказки на таймлайне
+    return re.sub(r"\s*<br\s*/?>\s*", " ", job.role)
+
+
+def print_skills(data: CVData) -> list[tuple[str, int]]:
+    """Скиллы по всем работам с максимальным уровнем, сильные — первыми."""
+    levels: dict[str, int] = {}
+    for job in data.jobs:
+        for name, level in job.skills.items():
+            levels[name] = max(level, levels.get(name, 0))
+    return sorted(levels.items(), key=lambda kv: -kv[1])
+
+
+def build_print_html(data: CVData) -> bytes:
+    esc = html_lib.escape
+    p = data.profile
+    contacts = " · ".join(esc(x) for x in (p.location, p.email, p.telegram, p.linkedin) if x)
+
+    stack_label = ui("stack")
+    jobs = []
+    for job in data.jobs:
+        jobs.append(
+            f'<div class="job"><div class="head"><h3>{esc(job.company)} — {esc(print_role(job))}</h3>'
+            f'<span class="muted">{esc(job.period)}</span></div>'
+            f"<ul>{''.join(f'<li>{esc(t)}</li>' for t in job.tasks)}</ul>"
+            f'<div class="muted">{esc(stack_label)}{esc(" · ".join(job.stack))}</div></div>'
+        )
+    skills = "".join(
+        f"<li><b>{esc(name)}</b> {level}/10" + (f" — {esc(data.skill_hints[name])}" if name in data.skill_hints else "") + "</li>"
+        for name, level in print_skills(data)
+    )
+    kpi = "".join(f'<div><span class="muted">{esc(k)}</span><b>{esc(v)}</b></div>' for k, v in p.numbers)
+
+    page = (
+        f'<!DOCTYPE html><html lang="{data.locale}"><head><meta charset="utf-8">'
+        f"<title>CV — {esc(p.name)}</title>"
+        f'<link rel="alternate" type="application/pdf" href="cv.pdf">'
+        f"<style>{PRINT_CSS}</style></head><body>"
+        f'<h1>{esc(p.name)}</h1><div>{esc(p.title)}</div><div class="muted">{contacts}</div>'
+        f'<div class="kpi">{kpi}</div>'
+        f"<h2>{esc(ui('about'))}</h2><p>{esc(p.about)}</p>"
+        f"<h2>{esc(ui('career'))}</h2>{''.join(jobs)}"
+        f"<h2>{esc(ui('education'))}</h2><div>{esc(data.education.short)}</div>"
+        f"<ul>{''.join(f'<li>{esc(x)}</li>' for x in data.education.details)}</ul>"
+        f"<h2>{esc(ui('skills'))}</h2><ul>{skills}</ul>"
+        "</body></html>"
+    )
+    return page.encode("utf-8")
+
+
+def build_pdf(data: CVData) -> bytes | None:
+    """Тот же состав, что у build_print_html; None — нет fpdf2 или шрифтов."""
+    if not PDF_ENABLED:
+        return None
+    from fpdf import FPDF
+
+    p = data.profile
+    pdf = FPDF(format="A4")
+    pdf.set_margins(18, 16, 18)
+    pdf.set_auto_page_break(True, margin=16)
+    pdf.add_font("cv", "", str(PDF_FONT))
+    pdf.add_font("cv", "B", str(PDF_FONT_BOLD))
+    pdf.set_title(f"CV — {p.name}")
+    pdf.set_author(p.name)
+    pdf.set_lang(data.locale)
+    pdf.add_page()
+
+    def text(s: str, size: float = 10, style: str = "", color: int = 17, indent: float = 0, h: float = 5):
+        pdf.set_font("cv", style, size)
+        pdf.set_text_color(color)
+        pdf.set_x(pdf.l_margin + indent)
+        pdf.multi_cell(0, h, s, new_x="LMARGIN", new_y="NEXT")
+
+    def bullets(items):
+        for item in items:
+            pdf.set_font("cv", "", 10)
+            pdf.set_text_color(17)
+            pdf.set_x(pdf.l_margin + 2)
+            pdf.cell(4, 5, "•")
+            pdf.multi_cell(0, 5, item, new_x="LMARGIN", new_y="NEXT")
+
+    def section(title: str):
+        pdf.ln(4)
+        text(title.upper(), size=11, style="B")
+        pdf.set_draw_color(209, 213, 219)
+        pdf.line(pdf.l_margin, pdf.get_y(), pdf.w - pdf.r_margin, pdf.get_y())
+        pdf.ln(2)
+
+    text(p.name, size=20, style="B", h=9)
+    text(p.title, size=11, h=6)
+    text(" · ".join(x for x in (p.location, p.email, p.telegram, p.linkedin) if x), size=9, color=107)
+    if p.numbers:
+        pdf.ln(2)
+        text("   ".join(f"{k}: {v}" for k, v in p.numbers), size=9)
+
+    section(ui("about"))
+    text(p.about)
+
+    section(ui("career"))
+    for job in data.jobs:
+        if pdf.will_page_break(20):  # заголовок работы не отрываем от первых строк
+            pdf.add_page()
+        pdf.ln(1)
+        text(f"{job.company} — {print_role(job)}", size=11, style="B", h=6)
+        text(job.period, size=9, color=107)
+        bullets(job.tasks)
+        text(ui("stack") + " · ".join(job.stack), size=9, color=107)
+        pdf.ln(2)
+
+    section(ui("education"))
+    text(data.education.short)
+    bullets(data.education.details)
+
+    section(ui("skills"))
+    bullets(
+        f"{name} {level}/10" + (f" — {data.skill_hints[name]}" if name in data.skill_hints else "")
+        for name, level in print_skills(data)
+    )
+    return bytes(pdf.output())
+
+
+PRINT_KINDS = {  # kind -> (сборка, mimetype)
+    "pdf": (build_pdf, "application/pdf"),
+    "html": (build_print_html, "text/html; charset=utf-8"),
+}
+_print_lock = threading.Lock()
+
+
+def print_artifact(kind: str) -> Path | None:
+    """Файл для текущей ревизии данных; собирается только если его ещё нет."""
+    data = current_cv()
+    path = PRINT_DIR / f"cv.{data.revision}.v{PRINT_VERSION}.{kind}"
+    if path.is_file():
+        return path
+
+    with _print_lock:
+        if path.is_file():
+            return path
+        body = PRINT_KINDS[kind][0](data)
+        if body is None:
+            return None
+        write_atomic(path, body)
+
+        # старые ревизии: оставляем PRINT_KEEP свежих (профили/локали живут рядом).
+        # *.tmp — чужие недописанные файлы; файл мог уже удалить другой воркер
+        files = []
+        for f in PRINT_DIR.glob("cv.*"):
+            if f.suffix == ".tmp":
+                continue
+            try:
+                files.append((f.stat().st_mtime, f))
+            except OSError:
+                continue
+        for _, old in sorted(files, reverse=True)[PRINT_KEEP:]:
+            try:
+                old.unlink(missing_ok=True)
+            except OSError:
+                pass
+    return path
+
+
+def send_print(kind: str) -> flask.Response:
+    path = print_artifact(kind)
+    if path is None:
+        flask.abort(404)
+    data = current_cv()
+    resp = flask.send_file(
+        path,
+        mimetype=PRINT_KINDS[kind][1],
+        conditional=True,  # 304 по If-None-Match/If-Modified-Since, 206 по Range
+        etag=f"{data.revision}-v{PRINT_VERSION}",
+        last_modified=path.stat().st_mtime,
+        download_name=f"CV {data.profile.name}.{kind}" if kind == "pdf" else None,
+        max_age=0,
+    )
+    resp.cache_control.no_cache = True  # URL без ревизии — всегда ревалидация
+    resp.accept_ranges = "bytes"  # werkzeug ставит его только в ответ на Range
+    return resp
+
+
+@app.server.route("/cv.pdf")
+def cv_pdf():
+    return send_print("pdf")
+
+
+@app.server.route("/print.html")
+def cv_print():
+    return send_print("html")
+
+
 # ----------------------------
 # Timeline  (НЕ ТРОГАЕМ)
 # ----------------------------
 def timeline_fig(selected_id: str):
-    # --- SAFE extraction of x values ---
-    try:
-        xs = [e["x"] for e in EXPERIENCE]
-    except KeyError:
-        raise KeyError(
-            "timeline_fig ожидает, что в EXPERIENCE у каждого элемента есть ключ 'x'. "
-            "Добавь 'x' (число, например 2019.5) в каждый job."
-        )
+    jobs = current_cv().jobs
+    xs = [e.x for e in jobs]  # x считается из start_date при загрузке cv.json
 
-    sel_idx = next((i for i, e in enumerate(EXPERIENCE) if e["id"] == selected_id), 0)
+    sel_idx = next((i for i, e in enumerate(jobs) if e.id == selected_id), 0)
     today = date.today()
     # --- Y positions ---
     y_line = 0.0
@@ -203,17 +1874,17 @@ def timeline_fig(selected_id: str):
 
     # --- Labels ---
     top_labels = [
-        f"<span style='font-size:11px; font-weight:800'>{e['company']}</span><br>"
-        f"<span style='font-size:10px; opacity:0.75'>{e['role']}</span>"
-        for e in EXPERIENCE
+        f"<span style='font-size:11px; font-weight:800'>{e.company}</span><br>"
+        f"<span style='font-size:10px; opacity:0.75'>{e.role}</span>"
+        for e in jobs
     ]
 
     bottom_labels = [
-        f"<span style='font-size:11px'>{e['start']}</span>"
-        for e in EXPERIENCE
+        f"<span style='font-size:11px'>{e.start}</span>"
+        for e in jobs
     ]
 
-    hover_text = ["Нажмите для отображения обязанностей"] * len(EXPERIENCE)
+    hover_text = [ui("job_hover")] * len(jobs)
 
     fig = go.Figure()
 
@@ -313,7 +1984,7 @@ def timeline_fig(selected_id: str):
             x=[current_x],
             y=[y_bottom],
             mode="text",
-            text=[f"<span style='font-size:11px'><b>{now_label_ru(today)}</b></span>"],
+            text=[f"<span style='font-size:11px'><b>{now_label(today)}</b></span>"],
             textposition="top center",
             hoverinfo="skip",
             showlegend=False,
@@ -344,206 +2015,545 @@ def timeline_fig(selected_id: str):
     return fig
 
 
+# ----------------------------
+# Timeline (scaled)
+# ----------------------------
+# Длинная история (сводные таймлайны команды): больше TIMELINE_SCALE_AT работ —
+# маркеры одним WebGL-трейсом, близкие работы схлопнуты в кластеры, подписи
+# только у кластеров. Порядок трейсов тот же, что в timeline_fig, поэтому
+# Patch активного маркера и clientside.js работают без изменений.
+TIMELINE_SCALE_AT = int(os.environ.get("CV_TIMELINE_SCALE_AT", "40"))
+TIMELINE_MAX_LABELS = 8  # кластеров (= подписей) на видимом отрезке оси
+SCALED_TRACES = (1, 4, 5)  # маркеры, верхние и нижние подписи — меняются при зуме
+
+timeline_index_cache = LRUCache(8, "timeline_index")
+
+
+def timeline_scaled(data: CVData) -> bool:
+    return len(data.jobs) > TIMELINE_SCALE_AT
+
+
+def timeline_index(data: CVData) -> tuple[tuple[Job, ...], list[float]]:
+    """Работы по возрастанию x и сами x: видимый отрезок ищется бисекцией."""
+    index = timeline_index_cache.get(data.revision)
+    if index is None:
+        ordered = tuple(sorted(data.jobs, key=lambda e: e.x))
+        index = (ordered, [e.x for e in ordered])
+        timeline_index_cache.put(data.revision, index)
+    return index
+
+
+def cluster_jobs(data: CVData, x0: float, x1: float) -> list[list[Job]]:
+    """Работы в [x0, x1], сгруппированные так, чтобы группа была уже (x1 - x0) / TIMELINE_MAX_LABELS."""
+    ordered, xs = timeline_index(data)
+    gap = (x1 - x0) / TIMELINE_MAX_LABELS
+    groups: list[list[Job]] = []
+    for job in ordered[bisect.bisect_left(xs, x0):bisect.bisect_right(xs, x1)]:
+        if groups and job.x - groups[-1][0].x < gap:
+            groups[-1].append(job)
+        else:
+            groups.append([job])
+    return groups
+
+
+def scaled_traces(groups: list[list[Job]]) -> dict[int, dict]:
+    """Данные трейсов SCALED_TRACES для набора кластеров — и для фигуры, и для Patch."""
+    xs = [sum(e.x for e in g) / len(g) for g in groups]
+    top, bottom, hover = [], [], []
+    for g in groups:
+        if len(g) == 1:
+            e = g[0]
+            top.append(
+                f"<span style='font-size:11px; font-weight:800'>{e.company}</span><br>"
+                f"<span style='font-size:10px; opacity:0.75'>{e.role}</span>"
+            )
+            bottom.append(f"<span style='font-size:11px'>{e.start}</span>")
+            hover.append(ui("job_hover"))
+        else:
+            names = ", ".join(dict.fromkeys(e.company for e in g[-3:]))
+            top.append(
+                f"<span style='font-size:11px; font-weight:800'>{ui('cluster').format(n=len(g))}</span><br>"
+                f"<span style='font-size:10px; opacity:0.75'>{names}</span>"
+            )
+            bottom.append(f"<span style='font-size:11px'>{g[0].start} – {g[-1].start}</span>")
+            hover.append(ui("cluster_hover").format(n=len(g)))
+    return {
+        1: {
+            "x": xs,
+            "y": [0.0] * len(xs),
+            "customdata": [g[-1].id for g in groups],  # клик по кластеру — самая поздняя работа
+            "text": hover,
+            "marker.size": [10 + 4 * min(len(g) - 1, 5) for g in groups],
+        },
+        4: {"x": xs, "y": [0.05] * len(xs), "text": top},
+        5: {"x": xs, "y": [-0.03] * len(xs), "text": bottom},
+    }
+
+
+def timeline_full_range(data: CVData) -> tuple[float, float]:
+    _, xs = timeline_index(data)
+    current_x = max(to_float_year(date.today()), xs[-1])
+    pad = max((current_x - xs[0]) * 0.03, 0.3)
+    return xs[0] - pad, current_x + pad
+
+
+def timeline_scaled_fig(selected_id: str) -> go.Figure:
+    data = current_cv()
+    job = resolve_job(data, selected_id)
+    x0, x1 = timeline_full_range(data)
+    traces = scaled_traces(cluster_jobs(data, x0, x1))
+    now_x = max(to_float_year(date.today()), timeline_index(data)[1][-1])
+    yellow, yellow_strong = "#FDE68A", "#FBBF24"
+
+    fig = go.Figure()
+    # 0) ось — два конца вместо точки на каждую работу
+    fig.add_trace(go.Scatter(x=[x0, now_x], y=[0.0, 0.0], mode="lines",
+                             line=dict(width=3, color="rgba(17,24,39,0.92)"), hoverinfo="skip", showlegend=False))
+    # 1) кластеры — WebGL
+    t = traces[1]
+    fig.add_trace(go.Scattergl(
+        x=t["x"], y=t["y"], customdata=t["customdata"], text=t["text"], mode="markers",
+        marker=dict(size=t["marker.size"], color=yellow, line=dict(width=2, color=yellow_strong), opacity=0.9),
+        hovertemplate="%{text}<extra></extra>", showlegend=False,
+    ))
+    # 2-3) активный маркер и ореол — как в timeline_fig
+    fig.add_trace(go.Scatter(x=[job.x], y=[0.0], mode="markers", hoverinfo="skip", showlegend=False,
+                             marker=dict(size=16, color=yellow, line=dict(width=4, color=yellow_strong))))
+    fig.add_trace(go.Scatter(x=[job.x], y=[0.0], mode="markers", hoverinfo="skip", showlegend=False,
+                             marker=dict(size=34, color="rgba(0,0,0,0)", line=dict(width=2, color="rgba(253,230,138,0.35)"))))
+    # 4-5) подписи кластеров: не больше TIMELINE_MAX_LABELS, не наезжают
+    for i, position in ((4, "bottom center"), (5, "top center")):
+        fig.add_trace(go.Scatter(x=traces[i]["x"], y=traces[i]["y"], text=traces[i]["text"], mode="text",
+                                 textposition=position, hoverinfo="skip", showlegend=False, cliponaxis=False))
+    # 6) «сейчас»
+    fig.add_trace(go.Scatter(
+        x=[now_x], y=[-0.03], mode="text", textposition="top center", hoverinfo="skip", showlegend=False,
+        text=[f"<span style='font-size:11px'><b>{now_label(date.today())}</b></span>"], cliponaxis=False,
+    ))
+
+    # зум только по x; uirevision сохраняет его при Patch активного маркера
+    fig.update_xaxes(visible=False, range=[x0, x1], fixedrange=False)
+    fig.update_yaxes(visible=False, autorange=True, fixedrange=True)
+    fig.update_layout(
+        height=140,
+        margin=dict(l=0, r=10, t=4, b=18),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        dragmode="zoom",
+        uirevision=data.revision,
+    )
+    return fig
+
+
+def timeline_zoom_patch(x_range) -> Patch:
+    """
+    Пересчёт кластеров и подписей под видимый отрезок оси. x_range приходит
+    из clientside.js (cv.zoom_range): [x0, x1] или "full" после двойного клика.
+    """
+    data = current_cv()
+    if not x_range or not timeline_scaled(data):
+        raise PreventUpdate
+    if x_range == "full":
+        x0, x1 = timeline_full_range(data)
+    else:
+        # данные клиента: ровно два конечных числа по возрастанию, иначе — без обновления
+        if (
+            not isinstance(x_range, list) or len(x_range) != 2
+            or not all(isinstance(x, (int, float)) and not isinstance(x, bool) and math.isfinite(x) for x in x_range)
+            or not x_range[0] < x_range[1]
+        ):
+            raise PreventUpdate
+        x0, x1 = map(float, x_range)
+
+    patch = Patch()
+    for i, props in scaled_traces(cluster_jobs(data, x0, x1)).items():
+        for prop, value in props.items():
+            if prop == "marker.size":
+                patch["data"][i]["marker"]["size"] = value
+            else:
+                patch["data"][i][prop] = value
+    if x_range == "full":
+        patch["layout"]["xaxis"]["range"] = [x0, x1]
+    return patch
+
+
+# ----------------------------
+# Timeline cache
+# ----------------------------
+TIMELINE_CACHE_SIZE = int(os.environ.get("CV_TIMELINE_CACHE_SIZE", "64"))
+RENDER_CACHE_SIZE = int(os.environ.get("CV_RENDER_CACHE_SIZE", "256"))  # прогрев заполняет не больше него
+# Переключение работы: двигаем только активный маркер/ореол через Patch
+TIMELINE_PATCH_UPDATES = True
+ACTIVE_TRACES = (2, 3)  # индексы "Active marker" и "Glow ring" в timeline_fig
+
+
+timeline_cache = LRUCache(TIMELINE_CACHE_SIZE, "timeline")
+render_cache = LRUCache(RENDER_CACHE_SIZE, "render")  # готовые выходы render_job
+
+
+def cached_timeline_fig(selected_id: str) -> dict:
+    """
+    timeline_fig с мемоизацией. В кэше лежит готовый dict фигуры (JSON-типы,
+    без объектов plotly) — попадание ничего не строит и не разбирает; его
+    не мутируем. Ключ содержит дату — подпись «сейчас» и ось обновятся после
+    полуночи.
+    """
+    data = current_cv()
+    # неизвестный id (приходит от клиента) -> первая работа, одна запись в кэше
+    job_id = resolve_job(data, selected_id).id
+    key = (job_id, data.revision, date.today().isoformat())
+    fig = timeline_cache.get(key)
+    if fig is None:
+        build = timeline_scaled_fig if timeline_scaled(data) else timeline_fig
+        fig = json.loads(build(job_id).to_json())
+        timeline_cache.put(key, fig)
+    return fig
+
+
+def timeline_key() -> str:
+    """Ревизия фигуры на клиенте: данные + дата (ось и «сейчас»)."""
+    return f"{data_revision()}:{date.today().isoformat()}"
+
+
+def timeline_patch(selected_id: str) -> Patch:
+    """Частичное обновление: только x/y активного маркера и ореола."""
+    data = current_cv()
+    job = resolve_job(data, selected_id)
+    patch = Patch()
+    for i in ACTIVE_TRACES:
+        patch["data"][i]["x"] = [job.x]
+        patch["data"][i]["y"] = [0.0]
+    return patch
+
 
 # ----------------------------
 # Skills (no ghosts + tooltips)
 # ----------------------------
+# Батарейка — один элемент на скилл: сегменты и заливку рисует CSS
+# по --level, подсказка — общий тултип #skill_tip по data-hint.
 def skills_block(job_id: str, skills_map: dict[str, int], prev_map: dict[str, int]):
     items = sorted(skills_map.items(), key=lambda kv: (-int(kv[1]), kv[0].lower()))
+    hints = current_cv().skill_hints
+    fallback = ui("hint_fallback")
     rows = []
-    tips = []
 
     for idx, (name, level) in enumerate(items):
         level = max(0, min(10, int(level)))
         prev_level = int(prev_map.get(name, 0)) if prev_map else 0
         grew = level > prev_level
 
-        row_style = {"animationDelay": f"{idx * 90}ms"}
+        row_style = {"--level": level, "--delay": f"{idx * 90}ms"}
         row_class = "row grow" if grew else "row"
 
-        segs = []
-        for i in range(10):
-            if i < level:
-                if grew:
-                    segs.append(html.Span(className="seg on", style={"animationDelay": f"{(idx*90) + (i*55)}ms"}))
-                else:
-                    segs.append(html.Span(className="seg on"))
-            else:
-                segs.append(html.Span(className="seg"))
-
-        sid = slug(name)
-        name_id = f"skill-name-{job_id}-{sid}"
-        bar_id = f"skill-bar-{job_id}-{sid}"
-
         rows.append(
             html.Div(
                 [
-                    html.Div(name, className="name", id=name_id),
-                    html.Div(segs, className="battery", id=bar_id),
+                    html.Div(name, className="name"),
+                    html.Div(className="battery"),
                 ],
                 className=row_class,
                 style=row_style,
+                **{"data-hint": hints.get(name, fallback)},
             )
         )
 
-        hint = SKILL_HINTS.get(name, "Добавь описание навыка в SKILL_HINTS.")
-        tips.append(dbc.Tooltip(hint, target=name_id, placement="top", trigger="hover"))
-        tips.append(dbc.Tooltip(hint, target=bar_id, placement="top", trigger="hover"))
-
     wrapper_key = f"skills-wrapper-{job_id}-" + "-".join([f"{slug(k)}{v}" for k, v in items])
-    return html.Div([html.Div(rows, className="skills")] + tips, key=wrapper_key)
+    return html.Div(html.Div(rows, className="skills"), key=wrapper_key)
+
+
+def client_data() -> dict:
+    """Данные для клиентского режима: только то, что рисует render_job."""
+    data = current_cv()
+    if STATIC_EXPORT:
+        # остальное — во фрагментах, здесь только id/x для клика и активного маркера
+        return {
+            "experience": [{"id": e.id, "x": e.x} for e in data.jobs],
+            "fragments": f"{FRAGMENTS_URL}{data.revision}/",
+            "active_traces": list(ACTIVE_TRACES),
+        }
+    fields = ("id", "company", "role", "period", "tasks", "stack", "skills", "x")
+    return {
+        "experience": [{k: getattr(e, k) for k in fields} for e in data.jobs],
+        "hints": data.skill_hints,
+        "default_hint": ui("hint_fallback"),
+        "stack_label": ui("stack"),
+        "active_traces": list(ACTIVE_TRACES),
+    }
 
 
 # ----------------------------
 # Layout
 # ----------------------------
-qr_url = find_qr_asset()
-
-timeline_card = html.Div(
-    className="cardx cardx-pad timeline-card",
-    children=[
-        html.Div("Карьера", className="h-title", style={"fontSize": "24px"}),
-        dcc.Graph(
-            id="timeline",
-            figure=timeline_fig(DEFAULT_JOB),
-            className="dash-graph",
-            animate=True,
-            config={"displayModeBar": False, "responsive": True},
-            style={"height": "120px"},
-        ),
-    ],
-)
+LAYOUT_CACHE_SIZE = URL_PREFIXES * (PROFILE_CACHE_SIZE + 4 if profiles else 4)  # ревизий cv.json в памяти
 
-job_card = html.Div(
-    id="job_card",
-    className="cardx cardx-pad cardx-active job-card",
-    children=[
-        html.Div(id="job_title", className="h-title", style={"fontSize": "20px"}),
-        html.Div(id="job_period", className="muted"),
-        html.Div("Обязанности", className="section-title"),
-        html.Div(id="job_tasks", className="scrollbox"),
-        html.Div(id="job_stack", className="muted"),
-    ],
-)
 
-edu_card = html.Div(
-    className="cardx cardx-pad edu-card",
-    children=[
-        html.Div("Образование", className="h-title", style={"fontSize": "20px"}),
-        dbc.Accordion(
-            [
-                dbc.AccordionItem(
-                    title=EDUCATION["short"],
-                    children=html.Ul([html.Li(x) for x in EDUCATION["details"]]),
-                )
-            ],
-            start_collapsed=True,
-            flush=True,
-            always_open=False,
-        ),
-    ],
-)
+def build_layout(data: CVData):
+    profile = data.profile
+    qr_url = qr_data_uri(profile.telegram)
+    prefix = app._config()["requests_pathname_prefix"]  # с /<locale>/ и /cv/<slug>/
+    print_links = [html.A(ui("print"), href=f"{prefix}print.html", target="_blank")]
+    if PDF_ENABLED:
+        print_links.insert(0, html.A("PDF", href=f"{prefix}cv.pdf", target="_blank"))
+    default_job = data.jobs[0].id
 
-skills_card = html.Div(
-    className="cardx cardx-dark cardx-pad skills-card grow-last",
-    children=[
-        html.Div("Скиллы", className="h-title", style={"fontSize": "20px"}),
-        html.Div(id="skills_container"),
-    ],
-)
+    timeline_card = html.Div(
+        className="cardx cardx-pad timeline-card",
+        children=[
+            html.Div(ui("career"), className="h-title", style={"fontSize": "24px"}),
+            dcc.Graph(
+                id="timeline",
+                figure=cached_timeline_fig(default_job),
+                className="dash-graph",
+                animate=True,
+                config={"displayModeBar": False, "responsive": True},
+                style={"height": "120px"},
+            ),
+        ],
+    )
 
-about_card = html.Div(
-    className="cardx cardx-pad about-eq",
-    children=[
-        html.Div("Обо мне", className="section-title"),
-        kpi_grid(),
-        html.Div(PROFILE["about"], className="about-text"),
-    ],
-)
+    job_card = html.Div(
+        id="job_card",
+        className="cardx cardx-pad cardx-active job-card",
+        children=[
+            html.Div(id="job_title", className="h-title", style={"fontSize": "20px"}),
+            html.Div(id="job_period", className="muted"),
+            html.Div(ui("duties"), className="section-title"),
+            html.Div(id="job_tasks", className="scrollbox"),
+            html.Div(id="job_stack", className="muted"),
+        ],
+    )
 
-contacts_card = html.Div(
-    className="cardx cardx-pad contacts-card grow-last",
-    children=[
-        html.Div("Контакты", className="section-title"),
-        html.Div(
-            className="contacts-grid",
-            children=[
-                html.Div(
-                    [
-                        html.Div(PROFILE["email"], className="muted"),
-                        html.Div(PROFILE["telegram"], className="muted"),
-                        html.Div(PROFILE["linkedin"], className="muted"),
-                    ]
-                ),
-                html.Img(src=qr_url, className="qr") if qr_url else html.Div("Добавь assets/qr.png", className="muted"),
-            ],
-        ),
-    ],
-)
+    edu_card = html.Div(
+        className="cardx cardx-pad edu-card",
+        children=[
+            html.Div(ui("education"), className="h-title", style={"fontSize": "20px"}),
+            dbc.Accordion(
+                [
+                    dbc.AccordionItem(
+                        title=data.education.short,
+                        children=html.Ul([html.Li(x) for x in data.education.details]),
+                    )
+                ],
+                start_collapsed=True,
+                flush=True,
+                always_open=False,
+            ),
+        ],
+    )
+
+    skills_card = html.Div(
+        className="cardx cardx-dark cardx-pad skills-card grow-last",
+        children=[
+            html.Div(ui("skills"), className="h-title", style={"fontSize": "20px"}),
+            html.Div(id="skills_container"),
+        ],
+    )
+
+    about_card = html.Div(
+        className="cardx cardx-pad about-eq",
+        children=[
+            html.Div(ui("about"), className="section-title"),
+            kpi_grid(profile),
+            html.Div(profile.about, className="about-text"),
+        ],
+    )
+
+    contacts_card = html.Div(
+        className="cardx cardx-pad contacts-card grow-last",
+        children=[
+            html.Div(ui("contacts"), className="section-title"),
+            html.Div(
+                className="contacts-grid",
+                children=[
+                    html.Div(
+                        [
+                            html.Div(profile.email, className="muted"),
+                            html.Div(profile.telegram, className="muted"),
+                            html.Div(profile.linkedin, className="muted"),
+                            html.Div(print_links, className="muted print-links"),
+                        ]
+                    ),
+                    html.Img(src=qr_url, className="qr", alt="QR: Telegram") if qr_url else html.Div(),
+                ],
+            ),
+        ],
+    )
 
-app.layout = html.Div(
-    className="page-wrap",
-    children=[
-        dbc.Row(
-            [
-                dbc.Col(
-                    width=4,
-                    children=html.Div(
-                        className="col-flex",
-                        children=[
-                            profile_hero(),
-                            about_card,
-                            contacts_card,
-                        ],
+    return html.Div(
+        className="page-wrap",
+        children=[
+            dbc.Row(
+                [
+                    dbc.Col(
+                        width=4,
+                        children=html.Div(
+                            className="col-flex",
+                            children=[
+                                profile_hero(profile),
+                                about_card,
+                                contacts_card,
+                            ],
+                        ),
                     ),
-                ),
-                dbc.Col(
-                    width=12, lg=8,
-                    children=html.Div(
-                        className="right-grid",
-                        children=[
-                            timeline_card,
-                            job_card,
-                            edu_card,
-                            skills_card,
-                        ],
+                    dbc.Col(
+                        width=12, lg=8,
+                        children=html.Div(
+                            className="right-grid",
+                            children=[
+                                timeline_card,
+                                job_card,
+                                edu_card,
+                                skills_card,
+                            ],
+                        ),
                     ),
-                ),
-            ],
-            className="g-0",
-            style={"--bs-gutter-x": "12px", "--bs-gutter-y": "12px"},
-        ),
-        dcc.Store(id="selected_job", data=DEFAULT_JOB),
-        dcc.Store(id="prev_skills", data={}),
-    ],
+                ],
+                className="g-0",
+                style={"--bs-gutter-x": "12px", "--bs-gutter-y": "12px"},
+            ),
+            dcc.Store(id="selected_job", data=default_job),
+            # единственный тултип скиллов, двигается assets/clientside.js
+            html.Div(
+                [html.Div(className="tooltip-arrow"), html.Div(className="tooltip-inner")],
+                id="skill_tip",
+                className="tooltip bs-tooltip-top",
+                role="tooltip",
+            ),
+            dcc.Store(id="prev_skills", data={}),
+            dcc.Store(id="timeline_rev", data=None),
+            dcc.Store(id="timeline_zoom", data=None),
+            *([dcc.Store(id="cv_data", data=client_data())] if CLIENTSIDE_JOBS or STATIC_EXPORT else []),
+            # маяки clientside.js: визит, время на работе и — в клиентском режиме — выбор работы
+            *([dcc.Store(id="analytics", data={"endpoint": "_cv-events", "selects": CLIENTSIDE_JOBS})] if analytics else []),
+        ],
+    )
+
+
+layout_cache = LRUCache(LAYOUT_CACHE_SIZE, "layout")
+
+
+def cached_layout():
+    """Layout текущей ревизии cv.json: Dash вызывает его на каждый /_dash-layout."""
+    data = current_cv()
+    # в layout ссылки с префиксом URL и фигура с подписью «сейчас» — она меняется с датой
+    key = (url_locale(), current_profile(), timeline_key())
+    layout = layout_cache.get(key)
+    if layout is None:
+        layout = build_layout(data)
+        layout_cache.put(key, layout)
+    return layout
+
+
+# Dash кладёт validation_layout в _dash-config каждого index; у layout-функции
+# это был бы весь layout на момент импорта. Для проверки колбэков хватает id.
+# Задаём его до app.layout — тогда Dash не строит layout (и фигуру) при импорте.
+app.validation_layout = html.Div(
+    [dcc.Graph(id="timeline")]
+    + [html.Div(id=i) for i in ("job_title", "job_period", "job_tasks", "job_stack", "skills_container")]
+    + [dcc.Store(id=i) for i in ("selected_job", "prev_skills", "timeline_rev", "timeline_zoom", "cv_data", "analytics")]
 )
+app.layout = cached_layout
 
 # ----------------------------
 # Callbacks
 # ----------------------------
-@app.callback(
-    Output("selected_job", "data"),
-    Input("timeline", "clickData"),
-    prevent_initial_call=True,
-)
 def on_click_timeline(clickData):
     # аккуратно: если клик вне точки — просто ничего не меняем
-    if not clickData or not clickData.get("points"):
+    if not isinstance(clickData, dict) or not isinstance(clickData.get("points"), list) or not clickData["points"]:
         raise PreventUpdate
 
-    pn = clickData["points"][0].get("pointNumber")
-    if pn is None:
+    point = clickData["points"][0]
+    if not isinstance(point, dict):
         raise PreventUpdate
+    data = current_cv()
+    job_id = point.get("customdata")
+    # данные клиента: customdata может оказаться чем угодно из JSON
+    if not isinstance(job_id, str) or job_id not in data.by_id:  # иначе кластер длинного таймлайна
+        pn = point.get("pointNumber")
+        if not isinstance(pn, int) or isinstance(pn, bool) or not 0 <= pn < len(data.jobs):
+            raise PreventUpdate
+        job_id = data.jobs[pn].id
+
+    if analytics is not None:
+        analytics.record("select", job_id)  # только в очередь, запись — в фоне
+    return job_id
+
+
+def build_job_outputs(job_id, prev_skills, patch: bool):
+    data = current_cv()
+    job = resolve_job(data, job_id)
+
+    fig = timeline_patch(job_id) if patch else cached_timeline_fig(job_id)
+    title = f"{job.company} — {job.role}"
+    period = job.period
+    tasks = ul(job.tasks)
+    stack = ui("stack") + " · ".join(job.stack)
+
+    current_skills = job.skills
+    prev_skills = prev_skills or {}
 
-    pn = int(pn)
-    if 0 <= pn < len(EXPERIENCE):
-        return EXPERIENCE[pn]["id"]
-
-    raise PreventUpdate
+    skills_ui = skills_block(job_id, current_skills, prev_skills) if current_skills else html.Div("—", className="muted")
 
+    return fig, title, period, tasks, stack, skills_ui, current_skills
 
 
-@app.callback(
+def render_job(job_id, prev_skills, client_rev=None):
+    # полная фигура — при первой загрузке или если данные/дата сменились
+    rev = timeline_key()
+    patch = TIMELINE_PATCH_UPDATES and client_rev == rev
+    # данные клиента: ключ кэша — только из известного id и словаря скиллов
+    job_id = resolve_job(current_cv(), job_id).id
+    if not isinstance(prev_skills, dict):
+        prev_skills = {}
+
+    key = (job_id, json.dumps(prev_skills or {}, sort_keys=True), patch, rev)
+    out = render_cache.get(key)
+    if out is None:
+        out = build_job_outputs(job_id, prev_skills, patch) + (rev,)
+        render_cache.put(key, out)
+    return out
+
+
+def warm_render_cache(share: int = 1) -> int:
+    """
+    Прогрев render_cache при старте воркера. Сначала первая загрузка каждой
+    работы (полная фигура и Patch с пустым prev_skills), затем переходы между
+    работами — Patch с prev_skills другой работы, как при кликах в открытой
+    вкладке. Комбинаций квадрат от числа работ, поэтому прогрев идёт не дальше
+    1/share ёмкости render_cache (share — сколько локалей делят кэш): лишнее
+    вытеснило бы уже прогретое. Полных фигур — не больше доли timeline_cache;
+    для длинного таймлайна переходов нет.
+    """
+    data = current_cv()
+    rev = timeline_key()
+    scaled = timeline_scaled(data)
+    figures = TIMELINE_CACHE_SIZE // share
+
+    calls = []
+    for i, e in enumerate(data.jobs):
+        if i < figures:
+            calls.append((e.id, {}, None))
+        calls.append((e.id, {}, rev))
+    if not scaled:
+        calls += [(e.id, prev.skills, rev) for prev in data.jobs for e in data.jobs if e is not prev]
+
+    calls = calls[: render_cache.maxsize // share]
+    for job_id, prev, client_rev in calls:
+        render_job(job_id, prev, client_rev)
+    return len(calls)
+
+
+def static_fragment(job_id: str) -> dict:
+    """
+    Выходы render_job для статического сайта (без фигуры — активный маркер
+    двигает clientside.js). Скиллы собраны с пустым prev_skills: классы
+    "grow" браузер пересчитывает по своему prev_skills.
+    """
+    _, title, period, tasks, stack, skills_ui, current_skills = build_job_outputs(job_id, {}, False)
+    return {"title": title, "period": period, "tasks": tasks, "stack": stack, "skills": skills_ui, "current": current_skills}
+
+
+JOB_OUTPUTS = [
     Output("timeline", "figure"),
     Output("job_title", "children"),
     Output("job_period", "children"),
@@ -551,26 +2561,94 @@ def on_click_timeline(clickData):
     Output("job_stack", "children"),
     Output("skills_container", "children"),
     Output("prev_skills", "data"),
-    Input("selected_job", "data"),
-    State("prev_skills", "data"),
-)
-def render_job(job_id, prev_skills):
-    job = next((e for e in EXPERIENCE if e["id"] == job_id), EXPERIENCE[0])
-
-    fig = timeline_fig(job_id)
-    title = f"{job['company']} — {job['role']}"
-    period = job["period"]
-    tasks = ul(job["tasks"])
-    stack = "Стек: " + " · ".join(job["stack"])
-
-    current_skills = job.get("skills", {}) or {}
-    prev_skills = prev_skills or {}
-
-    skills_ui = skills_block(job_id, current_skills, prev_skills) if current_skills else html.Div("—", className="muted")
+]
 
-    return fig, title, period, tasks, stack, skills_ui, current_skills
+if CLIENTSIDE_JOBS or STATIC_EXPORT:
+    app.clientside_callback(
+        ClientsideFunction("cv", "on_click_timeline"),
+        Output("selected_job", "data"),
+        Input("timeline", "clickData"),
+        State("cv_data", "data"),
+        prevent_initial_call=True,
+    )
+    app.clientside_callback(
+        ClientsideFunction("cv", "render_fragment" if STATIC_EXPORT else "render_job"),
+        *JOB_OUTPUTS,
+        Input("selected_job", "data"),
+        State("cv_data", "data"),
+        State("prev_skills", "data"),
+        State("timeline", "figure"),
+    )
+else:
+    app.callback(
+        Output("selected_job", "data"),
+        Input("timeline", "clickData"),
+        prevent_initial_call=True,
+    )(on_click_timeline)
+    app.callback(
+        *JOB_OUTPUTS,
+        Output("timeline_rev", "data"),
+        Input("selected_job", "data"),
+        State("prev_skills", "data"),
+        State("timeline_rev", "data"),
+    )(render_job)
+
+# зум длинного таймлайна: браузер отсеивает relayout без смены оси x
+app.clientside_callback(
+    ClientsideFunction("cv", "zoom_range"),
+    Output("timeline_zoom", "data"),
+    Input("timeline", "relayoutData"),
+    State("timeline", "figure"),
+    prevent_initial_call=True,
+)
+if analytics is not None:
+    app.clientside_callback(
+        ClientsideFunction("cv", "track_job"),
+        Output("analytics", "data"),
+        Input("selected_job", "data"),
+        State("analytics", "data"),
+    )
+if not STATIC_EXPORT:
+    app.callback(
+        Output("timeline", "figure", allow_duplicate=True),
+        Input("timeline_zoom", "data"),
+        prevent_initial_call=True,
+    )(timeline_zoom_patch)
 
 server = app.server
+startup_phase("callbacks")
+
+
+def warm_startup() -> dict[str, float]:
+    """
+    Всё, что иначе делает первый запрос каждого воркера: данные, layout и
+    index со сжатыми копиями, фигуры и выходы render_job. gunicorn.conf.py
+    вызывает это в мастере до fork — воркеры получают готовое через COW.
+    """
+    global _phase_started
+    _phase_started = time.perf_counter()
+
+    current_cv()
+    startup_phase("data")
+
+    client = server.test_client()
+    client.environ_base["cv.warmup"] = True  # прогрев не попадает в /metrics
+    for prefix in ["/", *(f"/{locale}/" for locale in locale_stores)]:
+        for url in ("", "_dash-layout", "_dash-dependencies"):
+            for encoding in ("br, gzip", "gzip", "identity"):
+                client.get(prefix + url, headers={"Accept-Encoding": encoding})
+    startup_phase("layout")
+
+    share = 1 + len(locale_stores)  # render_cache и timeline_cache общие для локалей
+    warm_render_cache(share)
+    for locale in locale_stores:
+        with server.test_request_context(f"/{locale}/", environ_base={"cv.locale": locale}):
+            warm_render_cache(share)
+    startup_phase("render cache")
+
+    for cache in LRU_CACHES.values():
+        cache.reset_stats()  # воркеры считают попадания с нуля
+    return STARTUP
 
 if __name__ == "__main__":
     app.run(debug=True)
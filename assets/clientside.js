@@ -0,0 +1,270 @@
+/*
+ * Клиентское переключение работ (CLIENTSIDE_JOBS в app.py).
+ * Повторяет on_click_timeline / render_job / skills_block один-в-один,
+ * данные приходят один раз в Store "cv_data". В статической сборке
+ * (STATIC_EXPORT) вместо render_job — render_fragment.
+ *
+ * Плюс общий тултип скиллов (#skill_tip) — работает в обоих режимах.
+ */
+(function () {
+    function h(type, props, namespace) {
+        return {type: type, namespace: namespace || "dash_html_components", props: props};
+    }
+
+    function slug(s) {
+        return s.trim().replace(/[^a-zA-Z0-9_-]+/g, "-").replace(/^-+|-+$/g, "").toLowerCase();
+    }
+
+    function findJob(data, jobId) {
+        var jobs = data.experience;
+        for (var i = 0; i < jobs.length; i++) {
+            if (jobs[i].id === jobId) {
+                return jobs[i];
+            }
+        }
+        return jobs[0];
+    }
+
+    function moveActive(figure, data, job) {
+        var fig = Object.assign({}, figure);
+        fig.data = figure.data.slice();
+        data.active_traces.forEach(function (i) {
+            fig.data[i] = Object.assign({}, fig.data[i], {x: [job.x], y: [0.0]});
+        });
+        return fig;
+    }
+
+    function ul(items) {
+        return h("Ul", {children: items.map(function (x) { return h("Li", {children: x}); })});
+    }
+
+    function skillsBlock(data, jobId, skillsMap, prevMap) {
+        var items = Object.keys(skillsMap).map(function (k) { return [k, skillsMap[k]]; });
+        items.sort(function (a, b) {
+            var d = parseInt(b[1], 10) - parseInt(a[1], 10);
+            if (d !== 0) {
+                return d;
+            }
+            var an = a[0].toLowerCase(), bn = b[0].toLowerCase();
+            return an < bn ? -1 : (an > bn ? 1 : 0);
+        });
+
+        var rows = items.map(function (kv, idx) {
+            var name = kv[0];
+            var level = Math.max(0, Math.min(10, parseInt(kv[1], 10)));
+            var prevLevel = prevMap ? parseInt(prevMap[name] || 0, 10) : 0;
+            var grew = level > prevLevel;
+
+            return h("Div", {
+                children: [
+                    h("Div", {children: name, className: "name"}),
+                    h("Div", {className: "battery"}),
+                ],
+                className: grew ? "row grow" : "row",
+                style: {"--level": level, "--delay": (idx * 90) + "ms"},
+                "data-hint": data.hints[name] || data.default_hint,
+            });
+        });
+
+        var key = "skills-wrapper-" + jobId + "-" + items.map(function (kv) {
+            return slug(kv[0]) + kv[1];
+        }).join("-");
+        return h("Div", {children: h("Div", {children: rows, className: "skills"}), key: key});
+    }
+
+    // Один тултип на все скиллы (#skill_tip в layout): делегирование через document.
+    function bindSkillTip() {
+        var current = null;
+
+        function hide() {
+            var tip = document.getElementById("skill_tip");
+            if (tip) {
+                tip.classList.remove("show");
+            }
+            current = null;
+        }
+
+        document.addEventListener("mouseover", function (ev) {
+            var row = ev.target.closest && ev.target.closest(".skills [data-hint]");
+            var tip = document.getElementById("skill_tip");
+            if (!row || !tip) {
+                return;
+            }
+            if (row === current) {
+                return;
+            }
+            current = row;
+            tip.querySelector(".tooltip-inner").textContent = row.getAttribute("data-hint");
+
+            var r = row.getBoundingClientRect();
+            var t = tip.getBoundingClientRect();
+            var left = Math.max(4, r.left + r.width / 2 - t.width / 2);
+            tip.style.transform = "translate(" + left + "px," + (r.top - t.height - 6) + "px)";
+            tip.querySelector(".tooltip-arrow").style.left = (r.left + r.width / 2 - left - 6) + "px";
+            tip.classList.add("show");
+        });
+        document.addEventListener("mouseout", function (ev) {
+            if (current && !current.contains(ev.relatedTarget)) {
+                hide();
+            }
+        });
+        window.addEventListener("scroll", hide, true);
+    }
+
+    if (typeof document !== "undefined") {
+        bindSkillTip();
+    }
+
+    // Статический сайт (export.py): фрагменты работ — fragments/<ревизия>/<job>.json
+    var fragments = {};
+
+    function loadFragment(data, jobId) {
+        var url = data.fragments + encodeURIComponent(jobId) + ".json";
+        if (!fragments[url]) {
+            fragments[url] = fetch(url).then(function (resp) {
+                if (!resp.ok) {
+                    delete fragments[url];
+                    throw new Error(url + ": " + resp.status);
+                }
+                return resp.text();
+            });
+        }
+        // текст, а не объект: каждый рендер получает свою копию дерева
+        return fragments[url].then(JSON.parse);
+    }
+
+    // Классы "grow" во фрагменте собраны без prev_skills — пересчитываем по своим
+    function markGrowth(skillsUi, prevSkills) {
+        var rows = skillsUi.props.children && skillsUi.props.children.props
+            ? skillsUi.props.children.props.children
+            : null;
+        (rows || []).forEach(function (row) {
+            var name = row.props.children[0].props.children;
+            var level = parseInt(row.props.style["--level"], 10);
+            row.props.className = level > parseInt(prevSkills[name] || 0, 10) ? "row grow" : "row";
+        });
+        return skillsUi;
+    }
+
+    // Аналитика (ANALYTICS в app.py): маяки на <prefix>_cv-events, ответ не ждём
+    var tracked = {job: null, since: 0, config: null};
+
+    function beacon(event) {
+        var config = JSON.parse(document.getElementById("_dash-config").textContent);
+        var url = config.requests_pathname_prefix + tracked.config.endpoint;
+        navigator.sendBeacon(url, JSON.stringify(event));
+    }
+
+    function flushDwell() {
+        if (tracked.job && tracked.since) {
+            beacon({type: "dwell", job: tracked.job, ms: Date.now() - tracked.since});
+        }
+        tracked.since = 0;
+    }
+
+    function bindDwell() {
+        // скрытая вкладка не считается: время закрываем и открываем заново
+        document.addEventListener("visibilitychange", function () {
+            if (document.visibilityState === "hidden") {
+                flushDwell();
+            } else if (tracked.job) {
+                tracked.since = Date.now();
+            }
+        });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        cv: {
+            on_click_timeline: function (clickData, data) {
+                var nu = window.dash_clientside.no_update;
+                if (!clickData || !clickData.points || !clickData.points.length) {
+                    return nu;
+                }
+                var pn = clickData.points[0].pointNumber;
+                if (pn === undefined || pn === null) {
+                    return nu;
+                }
+                var jobId = clickData.points[0].customdata;
+                if (typeof jobId === "string" && findJob(data, jobId).id === jobId) {
+                    return jobId; // кластер длинного таймлайна
+                }
+                pn = parseInt(pn, 10);
+                if (pn >= 0 && pn < data.experience.length) {
+                    return data.experience[pn].id;
+                }
+                return nu;
+            },
+
+            // relayout длинного (WebGL) таймлайна -> [x0, x1] | "full"; остальное не шлём на сервер
+            zoom_range: function (relayout, figure) {
+                var nu = window.dash_clientside.no_update;
+                if (!relayout || !figure || !figure.data[1] || figure.data[1].type !== "scattergl") {
+                    return nu;
+                }
+                if ("xaxis.range[0]" in relayout) {
+                    return [relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]];
+                }
+                if (relayout["xaxis.autorange"]) {
+                    return "full";
+                }
+                return nu;
+            },
+
+            track_job: function (jobId, config) {
+                var nu = window.dash_clientside.no_update;
+                if (!config || !navigator.sendBeacon) {
+                    return nu;
+                }
+                if (!tracked.config) {
+                    tracked.config = config;
+                    bindDwell();
+                    beacon({type: "visit"});
+                } else if (jobId !== tracked.job) {
+                    flushDwell();
+                    if (config.selects) {
+                        beacon({type: "select", job: jobId});
+                    }
+                }
+                tracked.job = jobId;
+                tracked.since = document.visibilityState === "hidden" ? 0 : Date.now();
+                return nu;
+            },
+
+            render_job: function (jobId, data, prevSkills, figure) {
+                var job = findJob(data, jobId);
+                var fig = moveActive(figure, data, job);
+
+                var current = job.skills || {};
+                prevSkills = prevSkills || {};
+                var skillsUi = Object.keys(current).length
+                    ? skillsBlock(data, job.id, current, prevSkills)
+                    : h("Div", {children: "—", className: "muted"});
+
+                return [
+                    fig,
+                    job.company + " — " + job.role,
+                    job.period,
+                    ul(job.tasks),
+                    data.stack_label + job.stack.join(" · "),
+                    skillsUi,
+                    current,
+                ];
+            },
+
+            render_fragment: function (jobId, data, prevSkills, figure) {
+                var job = findJob(data, jobId);
+                return loadFragment(data, job.id).then(function (frag) {
+                    return [
+                        moveActive(figure, data, job),
+                        frag.title,
+                        frag.period,
+                        frag.tasks,
+                        frag.stack,
+                        markGrowth(frag.skills, prevSkills || {}),
+                        frag.current,
+                    ];
+                });
+            },
+        },
+    });
+})();
@@ -0,0 +1,155 @@
+/*
+ * Service worker PWA-режима (CV_PWA в app.py). Отдаётся как <prefix>sw.js,
+ * сервер дописывает перед этим кодом self.CV = {cache, scope, prefix, precache}.
+ *
+ * - каркас (index, layout, колбэки, бандлы) кладётся в кэш при установке,
+ *   догруженное страницей (чанки, plotly, аватар) — по сообщению из index;
+ * - ассеты с отпечатком в имени — cache-first, они не меняются;
+ * - index/_dash-layout/_dash-dependencies — из кэша сразу, обновление в фоне;
+ * - render_job — сеть, при её отсутствии/таймауте — сохранённый ответ этой работы.
+ *
+ * Имя кэша содержит ревизию данных и хэш каркаса (отпечатки ассетов и
+ * бандлов, код воркера): новые данные или деплой -> новый sw.js -> свежий
+ * кэш, старый удаляется при активации.
+ */
+var CALLBACK_TIMEOUT = 3000; // мс: дольше ждём сеть — отвечаем из кэша
+var FINGERPRINTED = /\.v[\w-]+m[0-9a-f]+\.|\.[0-9a-f]{10}\./;
+
+self.addEventListener("install", function (event) {
+    event.waitUntil(
+        caches.open(CV.cache).then(function (cache) {
+            // без allSettled один недоступный CDN-стиль сорвал бы всю установку
+            return Promise.allSettled(CV.precache.map(function (url) {
+                return cache.add(new Request(url, {cache: "reload"}));
+            }));
+        }).then(function () {
+            return self.skipWaiting();
+        })
+    );
+});
+
+self.addEventListener("activate", function (event) {
+    event.waitUntil(
+        caches.keys().then(function (names) {
+            return Promise.all(names.filter(function (name) {
+                return name.indexOf(CV.scope) === 0 && name !== CV.cache;
+            }).map(function (name) {
+                return caches.delete(name);
+            }));
+        }).then(function () {
+            return self.clients.claim();
+        })
+    );
+});
+
+function cacheFirst(request) {
+    return caches.open(CV.cache).then(function (cache) {
+        return cache.match(request).then(function (hit) {
+            return hit || fetch(request).then(function (resp) {
+                if (resp.ok) {
+                    cache.put(request, resp.clone());
+                }
+                return resp;
+            });
+        });
+    });
+}
+
+function staleWhileRevalidate(event, request) {
+    return caches.open(CV.cache).then(function (cache) {
+        return cache.match(request).then(function (hit) {
+            var update = fetch(request).then(function (resp) {
+                if (resp.ok) {
+                    cache.put(request, resp.clone());
+                }
+                return resp;
+            });
+            if (hit) {
+                event.waitUntil(update.catch(function () {}));
+                return hit;
+            }
+            return update;
+        });
+    });
+}
+
+function withTimeout(promise, ms) {
+    return new Promise(function (resolve, reject) {
+        var timer = setTimeout(function () { reject(new Error("timeout")); }, ms);
+        promise.then(function (v) { clearTimeout(timer); resolve(v); }, function (e) { clearTimeout(timer); reject(e); });
+    });
+}
+
+// POST в Cache API не кладётся — ключ GET-запрос: работа + состояние клиента
+// (prev_skills, timeline_rev) и запасной ключ «последний ответ этой работы».
+function renderJob(event, payload) {
+    var base = CV.prefix + "_dash-update-component/render_job/" + encodeURIComponent(payload.inputs[0].value);
+    var exact = new Request(base + "?state=" + encodeURIComponent(JSON.stringify(payload.state || [])));
+    var latest = new Request(base);
+
+    var network = fetch(event.request).then(function (resp) {
+        if (resp.status === 200) {
+            event.waitUntil(caches.open(CV.cache).then(function (cache) {
+                return Promise.all([cache.put(exact, resp.clone()), cache.put(latest, resp.clone())]);
+            }));
+        }
+        return resp;
+    });
+    return withTimeout(network, CALLBACK_TIMEOUT).catch(function (err) {
+        return caches.open(CV.cache).then(function (cache) {
+            return cache.match(exact).then(function (hit) {
+                return hit || cache.match(latest);
+            });
+        }).then(function (hit) {
+            return hit || network;  // в кэше пусто — ждём сеть дальше
+        });
+    });
+}
+
+self.addEventListener("fetch", function (event) {
+    var request = event.request;
+    var url = new URL(request.url);
+
+    if (request.method === "POST" && url.pathname === CV.prefix + "_dash-update-component") {
+        event.respondWith(request.clone().json().then(function (payload) {
+            if (payload.output && payload.output.indexOf("job_title.children") !== -1) {
+                return renderJob(event, payload);
+            }
+            return fetch(request);
+        }, function () {
+            return fetch(request);
+        }));
+        return;
+    }
+    if (request.method !== "GET") {
+        return;
+    }
+
+    var local = url.origin === self.location.origin;
+    if (local && FINGERPRINTED.test(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.mode === "navigate" && url.pathname === CV.prefix) {
+        event.respondWith(staleWhileRevalidate(event, CV.prefix));
+    } else if (
+        CV.precache.indexOf(url.pathname + url.search) !== -1
+        || CV.precache.indexOf(request.url) !== -1
+        || (local && /\/(_dash-component-suites|assets)\//.test(url.pathname))
+    ) {
+        event.respondWith(staleWhileRevalidate(event, request));
+    }
+});
+
+// Что страница догрузила сама до установки воркера (async-чанки dcc,
+// plotly.min.js, выбранный вариант аватара) — index.html присылает списком.
+self.addEventListener("message", function (event) {
+    var urls = (event.data && event.data.cache) || [];
+    event.waitUntil(caches.open(CV.cache).then(function (cache) {
+        return Promise.all(urls.filter(function (url) {
+            return new URL(url).origin === self.location.origin;
+        }).map(function (url) {
+            return cache.match(url).then(function (hit) {
+                return hit || cache.add(url).catch(function () {});
+            });
+        }));
+    }));
+});
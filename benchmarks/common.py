@@ -0,0 +1,16 @@
+"""Общее для бенчмарков, которые поднимают сервер в отдельном процессе."""
+from __future__ import annotations
+
+import os
+import socket
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_env(**overrides: str) -> dict[str, str]:
+    """Окружение сервера: без аналитики — клики бенчмарка не визиты и не пишутся на диск."""
+    return dict(os.environ, CV_ANALYTICS_DB="", **overrides)
@@ -0,0 +1,73 @@
+"""
+Сколько байт экономит сжатие ответов на переключении работ.
+
+    python -m benchmarks.compression
+
+Гоняет in-process (Flask test client) последовательность кликов
+job3 -> job2 -> job1 -> job3 так же, как это делает браузер: с prev_skills
+и timeline_rev из предыдущего ответа, и печатает размер каждого ответа
+без сжатия / gzip / br.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app as cv  # noqa: E402
+
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def render_job_body(job_id: str, prev_skills: dict, timeline_rev: str | None) -> dict:
+    outputs = [
+        {"id": o.component_id, "property": o.component_property}
+        for o in cv.JOB_OUTPUTS + [cv.Output("timeline_rev", "data")]
+    ]
+    return {
+        "output": ".." + "...".join(f"{o['id']}.{o['property']}" for o in outputs) + "..",
+        "outputs": outputs,
+        "inputs": [{"id": "selected_job", "property": "data", "value": job_id}],
+        "state": [
+            {"id": "prev_skills", "property": "data", "value": prev_skills},
+            {"id": "timeline_rev", "property": "data", "value": timeline_rev},
+        ],
+        "changedPropIds": ["selected_job.data"],
+    }
+
+
+def fetch(client, method: str, url: str, encoding: str, **kwargs) -> int:
+    resp = getattr(client, method)(url, headers={"Accept-Encoding": encoding}, **kwargs)
+    assert resp.status_code == 200, (url, resp.status_code)
+    return len(resp.data)
+
+
+def main() -> None:
+    client = cv.server.test_client()
+    rows = []
+
+    for url in ("/", "/_dash-layout", "/_dash-dependencies"):
+        rows.append((url, *(fetch(client, "get", url, enc) for enc in ENCODINGS)))
+
+    prev_skills, timeline_rev = {}, None
+    for job_id in ("job3", "job2", "job1", "job3"):
+        body = render_job_body(job_id, prev_skills, timeline_rev)
+        sizes = [fetch(client, "post", "/_dash-update-component", enc, json=body) for enc in ENCODINGS]
+        data = client.post("/_dash-update-component", json=body).get_json()["response"]
+        prev_skills, timeline_rev = data["prev_skills"]["data"], data["timeline_rev"]["data"]
+        rows.append((f"render_job {job_id}", *sizes))
+
+    print(f"{'response':<24}{'identity':>10}{'gzip':>10}{'br':>10}{'saved':>8}")
+    for name, raw, gz, br in rows:
+        print(f"{name:<24}{raw:>10}{gz:>10}{br:>10}{1 - br / raw:>8.0%}")
+
+    switches = [r for r in rows if r[0].startswith("render_job")][1:]  # без первой загрузки
+    raw = sum(r[1] for r in switches) / len(switches)
+    br = sum(r[3] for r in switches) / len(switches)
+    print(f"\nper job switch: {raw:.0f} -> {br:.0f} bytes (br), saved {raw - br:.0f}")
+    print("compressed cache:", cv.compressed_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Микро-бенчмарки горячего пути: timeline_fig, skills_block, render_job,
+сборка layout и их JSON, плюс байты ответов колбэков.
+
+    python -m benchmarks.hotpath [--sizes 3 100 1000] [--compare benchmarks/results/<sha>.json]
+
+Данные — синтетические cv.json на 3/100/1000 работ (детерминированный seed),
+подставляются через app.cv_store. Кэши перед каждым замером чистятся, так что
+меряется работа самой функции, а не попадание в LRU (кроме строк "… (cached)").
+Результаты пишутся в benchmarks/results/<commit>.json; --compare печатает
+отношение к сохранённому прогону другого коммита.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app as cv  # noqa: E402
+from benchmarks.compression import render_job_body  # noqa: E402
+from plotly.io.json import to_json_plotly  # noqa: E402  (этим сериализует Dash)
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+MIN_TIME = 0.3  # сек на замер
+MAX_RUNS = 300
+SKILLS = [
+    "Python", "SQL", "Airflow", "Power BI", "Tableau", "ClickHouse", "PostgreSQL", "pandas",
+    "dbt", "Spark", "Kafka", "Docker", "Git", "Excel", "Statistics", "A/B", "Leadership", "Mentoring",
+]
+RU_MON = cv.RU_MON
+
+
+def synthetic_cv(n: int, seed: int = 15) -> dict:
+    """Резюме на n работ: даты равномерно за 30 лет, 6–10 скиллов у каждой."""
+    rnd = random.Random(seed)
+    base = json.loads((ROOT / "cv.json").read_text(encoding="utf-8"))
+    days = sorted((rnd.randrange(0, 30 * 365) for _ in range(n)), reverse=True)
+    experience = []
+    for i, d in enumerate(days):
+        start = date.fromordinal(date(1995, 1, 1).toordinal() + d)
+        experience.append({
+            "id": f"job{i + 1}",
+            "company": f"Компания {i + 1}",
+            "role": rnd.choice(["Аналитик", "Senior BI", "Team Lead", "Data Engineer"]),
+            "period": f"{RU_MON[start.month - 1]} {start.year} — …",
+            "start": f"{RU_MON[start.month - 1]} {start.year}",
+            "start_date": start.isoformat(),
+            "tasks": [f"Задача {k + 1} с описанием средней длины для списка обязанностей" for k in range(5)],
+            "stack": rnd.sample(SKILLS, 6),
+            "skills": {s: rnd.randint(3, 10) for s in rnd.sample(SKILLS, rnd.randint(6, 10))},
+        })
+    return dict(base, experience=experience, skill_hints={s: f"Подсказка для {s}" for s in SKILLS})
+
+
+def use_dataset(doc: dict, tmp: Path) -> None:
+    path = tmp / f"cv-{len(doc['experience'])}.json"
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+    cv.cv_store = cv.CVStore(path, float("inf"))  # без stat() в замерах
+
+
+def clear_caches() -> None:
+    for cache in (cv.timeline_cache, cv.render_cache, cv.layout_cache, cv.prebuilt_cache, cv.compressed_cache):
+        cache.clear()
+
+
+def bench(fn, setup=clear_caches) -> dict:
+    times = []
+    while (sum(times) < MIN_TIME and len(times) < MAX_RUNS) or len(times) < 3:
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return {"median_us": statistics.median(times) * 1e6, "min_us": min(times) * 1e6, "runs": len(times)}
+
+
+def timings(n: int) -> list[dict]:
+    data = cv.current_cv()
+    job, prev = data.jobs[len(data.jobs) // 2], data.jobs[0]
+    fig = cv.timeline_fig(job.id)
+    scaled = cv.timeline_scaled_fig(job.id)
+    skills = cv.skills_block(job.id, job.skills, prev.skills)
+    outputs = cv.build_job_outputs(job.id, prev.skills, False)
+    layout = cv.build_layout(data)
+
+    cases = {
+        "timeline_fig": lambda: cv.timeline_fig(job.id),
+        "timeline_fig json": lambda: fig.to_json(),
+        "timeline_scaled_fig": lambda: cv.timeline_scaled_fig(job.id),
+        "timeline_scaled_fig json": lambda: scaled.to_json(),
+        "skills_block": lambda: cv.skills_block(job.id, job.skills, prev.skills),
+        "skills_block json": lambda: to_json_plotly(skills),
+        "render_job": lambda: cv.render_job(job.id, prev.skills, None),
+        "render_job json": lambda: to_json_plotly(outputs),
+        "render_job patch": lambda: cv.render_job(job.id, prev.skills, cv.timeline_key()),
+        "render_job (cached)": lambda: cv.render_job(job.id, prev.skills, None),
+        "build_layout": lambda: cv.build_layout(data),
+        "build_layout json": lambda: to_json_plotly(layout),
+    }
+    rows = []
+    with cv.server.test_request_context():
+        for name, fn in cases.items():
+            setup = None if name.endswith(("json", "(cached)")) else clear_caches
+            if name == "render_job (cached)":
+                fn()
+            rows.append({"dataset": n, "name": name, **bench(fn, setup)})
+    return rows
+
+
+def payloads(n: int) -> list[dict]:
+    """Байты ответов колбэков, как их видит браузер: первая загрузка и переключение."""
+    clear_caches()
+    client = cv.server.test_client()
+    data = cv.current_cv()
+    first, second = data.jobs[0].id, data.jobs[len(data.jobs) // 2].id
+
+    rows, prev, rev = [], {}, None
+    for callback, job_id in (("render_job first", first), ("render_job switch", second)):
+        body = render_job_body(job_id, prev, rev)
+        raw = client.post("/_dash-update-component", json=body)
+        payload = raw.get_data()
+        response = json.loads(payload)["response"]
+        prev, rev = response["prev_skills"]["data"], response["timeline_rev"]["data"]
+        rows.append({
+            "dataset": n, "callback": callback, "identity": len(payload),
+            "gzip": len(gzip.compress(payload, 6)),
+            **({"br": len(cv.brotli.compress(payload, quality=5))} if cv.brotli else {}),
+        })
+
+    layout = client.get("/_dash-layout", headers={"Accept-Encoding": "identity"}).get_data()
+    rows.append({"dataset": n, "callback": "_dash-layout", "identity": len(layout), "gzip": len(gzip.compress(layout, 6))})
+    return rows
+
+
+def commit() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True)
+        return sha.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 100, 1000])
+    parser.add_argument("--out", type=Path, help="файл результатов (по умолчанию benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="прошлый прогон для сравнения")
+    args = parser.parse_args()
+
+    result = {
+        "commit": commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "timings": [],
+        "payloads": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            use_dataset(synthetic_cv(n), Path(tmp))
+            result["timings"] += timings(n)
+            result["payloads"] += payloads(n)
+
+    base = {}
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))
+        base = {(r["dataset"], r["name"]): r["median_us"] for r in old["timings"]}
+
+    print(f"{'jobs':>6}  {'benchmark':<28}{'median, µs':>14}{'min, µs':>12}{'runs':>6}" + ("    vs base" if base else ""))
+    for r in result["timings"]:
+        line = f"{r['dataset']:>6}  {r['name']:<28}{r['median_us']:>14.0f}{r['min_us']:>12.0f}{r['runs']:>6}"
+        if (r["dataset"], r["name"]) in base:
+            line += f"{r['median_us'] / base[r['dataset'], r['name']]:>10.2f}x"
+        print(line)
+
+    print(f"\n{'jobs':>6}  {'response':<28}{'identity':>10}{'gzip':>10}{'br':>10}")
+    for r in result["payloads"]:
+        print(f"{r['dataset']:>6}  {r['callback']:<28}{r['identity']:>10}{r['gzip']:>10}{r.get('br', '-'):>10}")
+
+    out = args.out or RESULTS_DIR / f"{result['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"\nsaved {out}")
+
+
+if __name__ == "__main__":
+    main()
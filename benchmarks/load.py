@@ -0,0 +1,211 @@
+"""
+Нагрузочный прогон: параллельные посетители против server.
+
+    python -m benchmarks.load [--configs 1x1 2x1 4x1 2x4] [--users 16] [--duration 10]
+    python -m benchmarks.load --in-process --users 4
+
+Каждый посетитель: index, /_dash-layout, /_dash-dependencies, затем клики по
+таймлайну — on_click_timeline и render_job с prev_skills/timeline_rev из
+предыдущего ответа, как у браузера. Конфиг WxT — gunicorn -w W --threads T
+(T > 1 -> gthread) на локальном порту; --in-process гоняет Flask test client
+в потоках этого же процесса. Печатает пропускную способность и p50/p95/p99
+по эндпоинтам. Серверные колбэки есть только без CV_CLIENTSIDE_JOBS.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ["CV_ANALYTICS_DB"] = ""  # до импорта app (--in-process): клики бенчмарка не пишутся
+
+from benchmarks.common import free_port, server_env  # noqa: E402
+from benchmarks.compression import render_job_body  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HEADERS = {"Accept-Encoding": "br, gzip", "Content-Type": "application/json"}
+
+
+def click_body(point: int) -> dict:
+    return {
+        "output": "selected_job.data",
+        "outputs": {"id": "selected_job", "property": "data"},
+        "inputs": [{"id": "timeline", "property": "clickData", "value": {"points": [{"curveNumber": 1, "pointNumber": point}]}}],
+        "changedPropIds": ["timeline.clickData"],
+    }
+
+
+class HTTPTransport:
+    """Одно keep-alive соединение на посетителя."""
+
+    def __init__(self, port: int):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    def request(self, method: str, path: str, body: dict | None = None) -> tuple[int, bytes]:
+        self.conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=HEADERS)
+        resp = self.conn.getresponse()
+        return resp.status, resp.read()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class InProcessTransport:
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method: str, path: str, body: dict | None = None) -> tuple[int, bytes]:
+        resp = self.client.open(path, method=method, json=body, headers={"Accept-Encoding": HEADERS["Accept-Encoding"]})
+        return resp.status_code, resp.get_data()
+
+    def close(self) -> None:
+        pass
+
+
+def decode(data: bytes) -> dict:
+    # ответы сжаты br/gzip — для состояния сессии распаковываем сами
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    elif brotli is not None and not data.lstrip().startswith(b"{"):
+        data = brotli.decompress(data)
+    return json.loads(data)
+
+
+def visitor(transport, stats, deadline: float, clicks: int, think: float, jobs: list[str], rnd: random.Random) -> None:
+    def timed(name, method, path, body=None):
+        t = time.perf_counter()
+        try:
+            status, data = transport.request(method, path, body)
+        except (OSError, http.client.HTTPException):
+            status, data = 0, b""
+        stats[name].append((time.perf_counter() - t, status))
+        return status, data
+
+    while time.perf_counter() < deadline:
+        timed("index", "GET", "/")
+        timed("_dash-layout", "GET", "/_dash-layout")
+        timed("_dash-dependencies", "GET", "/_dash-dependencies")
+
+        # первая загрузка: render_job для работы по умолчанию
+        prev, rev, job_id = {}, None, jobs[0]
+        status, data = timed("render_job", "POST", "/_dash-update-component", render_job_body(job_id, prev, rev))
+        if status == 200:
+            response = decode(data)["response"]
+            prev, rev = response["prev_skills"]["data"], response["timeline_rev"]["data"]
+        for _ in range(clicks):
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(think)
+            status, data = timed("on_click_timeline", "POST", "/_dash-update-component", click_body(rnd.randrange(len(jobs))))
+            if status == 200:
+                job_id = decode(data)["response"]["selected_job"]["data"]
+            elif status != 204:
+                continue
+            status, data = timed("render_job", "POST", "/_dash-update-component", render_job_body(job_id, prev, rev))
+            if status == 200:
+                response = decode(data)["response"]
+                prev, rev = response["prev_skills"]["data"], response["timeline_rev"]["data"]
+    transport.close()
+
+
+def run_load(make_transport, users: int, duration: float, clicks: int, think: float, jobs: list[str]) -> tuple[dict, float]:
+    stats: dict[str, list] = defaultdict(list)
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(
+            target=visitor,
+            args=(make_transport(), stats, deadline, clicks, think, jobs, random.Random(i)),
+            daemon=True,
+        )
+        for i in range(users)
+    ]
+    t = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    return stats, time.perf_counter() - t
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def report(title: str, stats: dict, elapsed: float) -> None:
+    total = sum(len(v) for v in stats.values())
+    print(f"\n{title}: {total} requests in {elapsed:.1f}s, {total / elapsed:.0f} req/s")
+    print(f"  {'endpoint':<22}{'count':>8}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, samples in stats.items():
+        lat = sorted(s[0] * 1000 for s in samples)
+        errors = sum(1 for s in samples if s[1] not in (200, 204, 304))
+        print(
+            f"  {name:<22}{len(samples):>8}{errors:>8}{len(samples) / elapsed:>8.0f}"
+            f"{percentile(lat, 50):>9.1f}{percentile(lat, 95):>9.1f}{percentile(lat, 99):>9.1f}"
+        )
+
+
+def start_gunicorn(workers: int, threads: int) -> tuple[subprocess.Popen, int]:
+    port = free_port()
+    cmd = [sys.executable, "-m", "gunicorn", "-w", str(workers), "--threads", str(threads), "-b", f"127.0.0.1:{port}", "app:server"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=server_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(300):
+        try:
+            if HTTPTransport(port).request("GET", "/_dash-layout")[0] == 200:
+                return proc, port
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"gunicorn {workers}x{threads} did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", nargs="+", default=["1x1", "2x1", "4x1", "2x4"], help="воркеры x потоки")
+    parser.add_argument("--users", type=int, default=16, help="одновременных посетителей")
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд на конфиг")
+    parser.add_argument("--clicks", type=int, default=5, help="кликов за визит")
+    parser.add_argument("--think", type=float, default=0.0, help="пауза между кликами, сек")
+    parser.add_argument("--in-process", action="store_true", help="без gunicorn: Flask test client")
+    args = parser.parse_args()
+
+    if args.in_process:
+        import app as cv
+
+        jobs = [e.id for e in cv.current_cv().jobs]
+        stats, elapsed = run_load(lambda: InProcessTransport(cv.server.test_client()),
+                                  args.users, args.duration, args.clicks, args.think, jobs)
+        report(f"in-process, {args.users} users", stats, elapsed)
+        return
+
+    jobs = subprocess.run(
+        [sys.executable, "-c", "import app; print(' '.join(e.id for e in app.current_cv().jobs))"],
+        cwd=ROOT, env=server_env(), capture_output=True, text=True, check=True,
+    ).stdout.splitlines()[-1].split()
+    for config in args.configs:
+        workers, threads = (int(x) for x in config.split("x"))
+        proc, port = start_gunicorn(workers, threads)
+        try:
+            stats, elapsed = run_load(lambda: HTTPTransport(port), args.users, args.duration, args.clicks, args.think, jobs)
+        finally:
+            proc.terminate()
+            proc.wait()
+        report(f"gunicorn -w {workers} --threads {threads}, {args.users} users", stats, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+First-contentful-paint обычного и критического (CV_CRITICAL_PATH=1) index.
+
+    pip install playwright && playwright install chromium
+    python -m benchmarks.paint [--runs 10] [--throttle]
+
+Поднимает два локальных сервера (по одному на режим), открывает страницу
+в headless Chromium с чистым кэшем и печатает медиану FCP и момент, когда
+React смонтировал layout (#job_title заполнен).
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.common import free_port, server_env
+
+ROOT = Path(__file__).resolve().parents[1]
+MODES = {"default": "0", "critical": "1"}
+# «Fast 3G» из DevTools: ~1.6 Мбит/с, 150 мс RTT
+THROTTLE = {"offline": False, "latency": 150, "downloadThroughput": 200_000, "uploadThroughput": 94_000}
+
+
+def start_server(critical: str) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = server_env(CV_CRITICAL_PATH=critical)
+    code = f"import app; app.server.run(host='127.0.0.1', port={port}, threaded=True)"
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"server on {url} did not start")
+
+
+def measure(browser, url: str, throttle: bool) -> tuple[float, float]:
+    context = browser.new_context(viewport={"width": 1024, "height": 900})
+    page = context.new_page()
+    if throttle:
+        cdp = context.new_cdp_session(page)
+        cdp.send("Network.enable")
+        cdp.send("Network.emulateNetworkConditions", THROTTLE)
+    page.goto(url, wait_until="commit")
+    page.wait_for_function("document.getElementById('job_title') && document.getElementById('job_title').textContent")
+    fcp = page.evaluate(
+        "performance.getEntriesByName('first-contentful-paint')[0]?.startTime ?? -1"
+    )
+    ready = page.evaluate("performance.now()")
+    context.close()
+    return fcp, ready
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--throttle", action="store_true", help="эмулировать Fast 3G")
+    args = parser.parse_args()
+
+    from playwright.sync_api import sync_playwright
+
+    servers = {mode: start_server(flag) for mode, flag in MODES.items()}
+    try:
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch()
+            print(f"{'mode':<10}{'FCP p50, ms':>14}{'layout p50, ms':>16}")
+            for mode, (_, url) in servers.items():
+                measure(browser, url, args.throttle)  # прогрев: аватар, сжатые копии, кэши
+                runs = [measure(browser, url, args.throttle) for _ in range(args.runs)]
+                fcp = statistics.median(r[0] for r in runs)
+                ready = statistics.median(r[1] for r in runs)
+                print(f"{mode:<10}{fcp:>14.0f}{ready:>16.0f}")
+            browser.close()
+    finally:
+        for proc, _ in servers.values():
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Холодный старт: фазы импорта app и время до первого ответа / память воркеров
+gunicorn с прогревом в мастере (CV_PRELOAD=1) и в каждом воркере (CV_PRELOAD=0).
+
+    python -m benchmarks.startup [--runs 5] [--workers 4]
+
+Память читается из /proc/<pid>/smaps_rollup (Linux): USS — страницы только
+этого воркера, PSS — с долей общих страниц мастера.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.common import free_port, server_env
+
+ROOT = Path(__file__).resolve().parents[1]
+PHASES_CODE = "import json, app; app.warm_startup(); print(json.dumps(app.STARTUP))"
+
+
+def import_phases(runs: int) -> dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", PHASES_CODE], cwd=ROOT, env=server_env(), capture_output=True, text=True, check=True)
+        phases = json.loads(out.stdout.strip().splitlines()[-1])
+        phases["process"] = time.perf_counter() - t
+        samples.append(phases)
+    return {name: statistics.median(s[name] for s in samples) for name in samples[0]}
+
+
+def wait_ok(url: str, timeout: float = 60) -> float:
+    t = time.perf_counter()
+    while time.perf_counter() - t < timeout:
+        try:
+            if urllib.request.urlopen(url, timeout=1).status == 200:
+                return time.perf_counter() - t
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer in {timeout}s")
+
+
+def children(pid: int) -> list[int]:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(x) for x in path.read_text().split()] if path.exists() else []
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def gunicorn_run(preload: str, workers: int) -> dict[str, float]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    env = server_env(CV_PRELOAD=preload)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "app:server"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        first = wait_ok(url)
+        # все воркеры подняты и ответили хотя бы раз
+        while len(children(proc.pid)) < workers:
+            time.sleep(0.05)
+        time.sleep(1.0 if preload == "0" else 0.2)
+        for _ in range(workers * 4):
+            urllib.request.urlopen(url + "_dash-layout").read()
+        mem = [memory_kb(pid) for pid in children(proc.pid)]
+
+        # «автоскейл»: убиваем воркеры, мастер форкает новые
+        for pid in children(proc.pid):
+            os.kill(pid, signal.SIGKILL)
+        time.sleep(0.05)
+        respawn = wait_ok(url)
+        return {
+            "first response, s": first,
+            "respawn -> response, s": respawn,
+            **{f"worker {k}, MB": statistics.mean(m[k] for m in mem) / 1024 for k in ("rss", "pss", "uss")},
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print("import + warm_startup phases (median):")
+    for name, sec in import_phases(args.runs).items():
+        print(f"  {name:<16}{sec * 1000:>8.0f} ms")
+
+    rows = {mode: gunicorn_run(flag, args.workers) for mode, flag in (("preload", "1"), ("per-worker", "0"))}
+    print(f"\ngunicorn -w {args.workers}{'':<10}" + "".join(f"{mode:>14}" for mode in rows))
+    for metric in rows["preload"]:
+        print(f"  {metric:<24}" + "".join(f"{rows[mode][metric]:>14.2f}" for mode in rows))
+
+
+if __name__ == "__main__":
+    main()
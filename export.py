@@ -0,0 +1,236 @@
+"""
+Статическая сборка резюме: сайт без Python, для любого файлового хостинга/CDN.
+
+    python export.py [--out dist]
+
+Собирает index.html (layout и колбэки вшиты в страницу), ассеты, бандлы
+Dash и fragments/<ревизия>/<job>.json — готовые выходы render_job для
+каждой работы; переключение работ в браузере — cv.render_fragment из
+assets/clientside.js. Рядом с каждым index.html — print.html и cv.pdf.
+Локали кроме основной — в <locale>/, с CV_PROFILES_DIR рядом кладутся
+cv/<slug>/.
+
+Сборка инкрементальная: хэши файлов прошлой сборки лежат в
+<out>/.export-manifest.json, перезаписываются только изменившиеся файлы,
+пропавшие (старая ревизия, старый отпечаток ассета) удаляются.
+Сайт рассчитан на размещение в корне домена.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.parse
+from pathlib import Path
+
+os.environ["CV_STATIC_EXPORT"] = "1"  # до импорта app: режим колбэков выбирается при импорте
+
+ROOT = Path(__file__).resolve().parent
+CWD = Path.cwd()
+os.chdir(ROOT)  # app ищет assets/ относительно рабочего каталога
+sys.path.insert(0, str(ROOT))
+
+import app as cv  # noqa: E402
+from dash.fingerprint import check_fingerprint  # noqa: E402
+from plotly.io.json import to_json_plotly  # noqa: E402  (этим сериализует Dash)
+
+MANIFEST = ".export-manifest.json"
+RESOURCE_RE = re.compile(r'/(?:_dash-component-suites|assets)/[^"\'\s)\\?]+|/_favicon\.ico')
+ASSET_REF_RE = re.compile(r'/assets/[^"\'\s)\\?,]+')
+CHUNK_FINGERPRINT_RE = re.compile(r'splice\(1,0,"(v[0-9_]+m[0-9]+)"\)')
+
+# Рендерер берёт layout и колбэки через fetch(<prefix>_dash-layout|_dash-dependencies)
+# и проверяет Content-Type, а файловый хостинг отдаёт файлы без расширения как
+# octet-stream. Поэтому оба ответа вшиты в страницу, fetch отвечает ими сам.
+FETCH_SHIM = """<script type="application/json" id="_cv-static-layout">{layout}</script>
+<script type="application/json" id="_cv-static-dependencies">{dependencies}</script>
+<script>(function () {{
+    var bodies = {{
+        "_dash-layout": document.getElementById("_cv-static-layout").textContent,
+        "_dash-dependencies": document.getElementById("_cv-static-dependencies").textContent
+    }};
+    var fetch = window.fetch;
+    window.fetch = function (input, init) {{
+        var path = (typeof input === "string" ? input : input.url).split("?")[0];
+        for (var name in bodies) {{
+            if (path.slice(-name.length) === name) {{
+                return Promise.resolve(new Response(bodies[name], {{headers: {{"Content-Type": "application/json"}}}}));
+            }}
+        }}
+        return fetch.apply(this, arguments);
+    }};
+}})();</script>
+"""
+
+
+def script_json(body: str) -> str:
+    # внутри <script> нельзя "</": иначе JSON закроет тег
+    return body.replace("</", "<\\/")
+
+
+class Site:
+    """Файлы сборки: путь на сайте -> байты, с записью только изменившегося."""
+
+    def __init__(self, out: Path):
+        self.out = out
+        self.files: dict[str, bytes] = {}
+
+    def add(self, path: str, body: bytes) -> None:
+        self.files[path.lstrip("/")] = body
+
+    def write(self) -> tuple[int, int, int]:
+        manifest_path = self.out / MANIFEST
+        try:
+            old = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            old = {}
+
+        new, written = {}, 0
+        for rel, body in sorted(self.files.items()):
+            digest = hashlib.sha1(body).hexdigest()
+            new[rel] = digest
+            target = self.out / rel
+            if old.get(rel) == digest and target.is_file():
+                continue
+            cv.write_atomic(target, body)
+            written += 1
+
+        removed = 0
+        for rel in old.keys() - new.keys():
+            target = self.out / rel
+            if target.is_file():
+                target.unlink()
+                removed += 1
+            for parent in target.parents:
+                if parent == self.out or not parent.is_dir() or any(parent.iterdir()):
+                    break
+                parent.rmdir()
+
+        self.out.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(new, indent=1, sort_keys=True), encoding="utf-8")
+        return written, len(new) - written, removed
+
+
+def layout_resources(node) -> set[str]:
+    """
+    URL ассетов из разобранного layout: src, srcSet, href — любые строки.
+    Регулярка по тексту JSON их не видит: plotly-кодировщик пишет "/" как \\u002f.
+    """
+    if isinstance(node, str):
+        return set(RESOURCE_RE.findall(node))
+    items = node.values() if isinstance(node, dict) else node if isinstance(node, list) else ()
+    return set().union(*map(layout_resources, items))
+
+
+def check_assets(site: Site) -> None:
+    """Каждая ссылка на /assets/ из страниц и фрагментов должна лежать в сборке."""
+    missing = set()
+    for rel, body in site.files.items():
+        if rel.endswith((".html", ".json")):
+            text = body.decode("utf-8", "replace").replace("\\u002f", "/")
+            missing |= {url for url in ASSET_REF_RE.findall(text) if url.lstrip("/") not in site.files}
+    if missing:
+        raise RuntimeError("assets referenced but not exported: " + ", ".join(sorted(missing)))
+
+
+def fetch(client, url: str) -> bytes:
+    resp = client.get(url, headers={"Accept-Encoding": "identity"})
+    if resp.status_code != 200:
+        raise RuntimeError(f"{url}: HTTP {resp.status_code}")
+    return resp.get_data()
+
+
+def export_page(site: Site, client, prefix: str, environ: dict) -> set[str]:
+    """index.html страницы со вшитыми layout/колбэками и фрагменты её работ."""
+    index = fetch(client, prefix).decode("utf-8")
+    layout = fetch(client, prefix + "_dash-layout").decode("utf-8")
+    dependencies = fetch(client, prefix + "_dash-dependencies").decode("utf-8")
+
+    shim = FETCH_SHIM.format(layout=script_json(layout), dependencies=script_json(dependencies))
+    marker = '<script id="_dash-renderer"'
+    if marker not in index:
+        raise RuntimeError(f"{prefix}: no {marker} in index")
+    site.add(prefix + "index.html", index.replace(marker, shim + marker, 1).encode("utf-8"))
+
+    # ссылки из карточки контактов — файлы рядом с index.html
+    site.add(prefix + "print.html", fetch(client, prefix + "print.html"))
+    if cv.PDF_ENABLED:
+        site.add(prefix + "cv.pdf", fetch(client, prefix + "cv.pdf"))
+
+    with cv.server.test_request_context(prefix, environ_base=environ):
+        data = cv.current_cv()
+        for job in data.jobs:
+            url = f"{cv.FRAGMENTS_URL}{data.revision}/{urllib.parse.quote(job.id)}.json"
+            site.add(url, to_json_plotly(cv.static_fragment(job.id)).encode("utf-8"))
+
+    return set(RESOURCE_RE.findall(index)) | layout_resources(json.loads(layout))
+
+
+def export_resources(site: Site, client, urls: set[str]) -> None:
+    fingerprints: dict[str, str] = {}  # каталог пакета -> отпечаток, с которым бандл грузит свои чанки
+    for url in sorted(urls):
+        body = fetch(client, url)
+        site.add(url, body)
+        if url.endswith(".js"):
+            m = CHUNK_FINGERPRINT_RE.search(body.decode("utf-8", "replace"))
+            if m:
+                fingerprints[url.rsplit("/", 1)[0]] = m.group(1)
+
+    # то, что бандлы догружают сами: async-чанки dcc/dash_table (по URL со своим
+    # отпечатком), plotly.min.js (без отпечатка)
+    loaded = {check_fingerprint(url)[0] for url in urls}
+    suites = cv.app.config.requests_pathname_prefix + "_dash-component-suites/"
+    for package, paths in cv.app.registered_paths.items():
+        for rel in paths:
+            url = f"{suites}{package}/{rel}"
+            if rel.endswith(".map") or url in loaded:
+                continue
+            directory, name = url.rsplit("/", 1)
+            if directory in fingerprints:
+                head, _, tail = name.partition(".")
+                site.add(f"{directory}/{head}.{fingerprints[directory]}.{tail}", fetch(client, url))
+            else:
+                site.add(url, fetch(client, url))
+
+
+def export_site(out: Path) -> tuple[int, int, int]:
+    site = Site(out)
+    client = cv.server.test_client()
+    client.environ_base["cv.warmup"] = True  # не попадает в /metrics
+
+    root = cv.app.config.requests_pathname_prefix
+    slugs = []
+    if cv.profiles is not None:
+        slugs = [
+            path.stem for path in sorted(cv.PROFILES_DIR.iterdir())
+            if path.suffix in cv.PROFILE_SUFFIXES and cv.PROFILE_PATH_RE.match(f"{cv.PROFILE_PREFIX}{path.stem}")
+        ]
+
+    urls = set()
+    # локаль по умолчанию — в корне, остальные — под /<locale>/ (как на сервере)
+    for locale in [None, *cv.locale_stores]:
+        prefix = root + (f"{locale}/" if locale else "")
+        environ = {"cv.locale": locale} if locale else {}
+        urls |= export_page(site, client, prefix, environ)
+        for slug in slugs:
+            urls |= export_page(site, client, f"{prefix}{cv.PROFILE_PREFIX[1:]}{slug}/", dict(environ, **{"cv.profile": slug}))
+
+    export_resources(site, client, urls)
+    check_assets(site)
+    return site.write()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", type=Path, default=ROOT / "dist", help="каталог сайта")
+    args = parser.parse_args()
+
+    written, unchanged, removed = export_site(CWD / args.out)
+    print(f"{args.out}: {written} written, {unchanged} unchanged, {removed} removed")
+
+
+if __name__ == "__main__":
+    main()
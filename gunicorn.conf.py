@@ -0,0 +1,38 @@
+# gunicorn подхватывает этот файл автоматически: gunicorn app:server
+import gc
+import os
+import shutil
+
+# app импортируется и прогревается в мастере один раз, воркеры получают
+# готовые кэши через copy-on-write. CV_PRELOAD=0 — прогрев в каждом воркере.
+preload_app = os.environ.get("CV_PRELOAD", "1") == "1"
+
+# /metrics: каждый воркер пишет свои счётчики сюда, любой воркер их суммирует.
+# Переменная должна быть выставлена до импорта prometheus_client (app).
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/cv-metrics")
+
+
+def on_starting(server):
+    # файлы прошлого запуска — иначе счётчики продолжатся со старых значений
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def _warm(log):
+    import app
+
+    phases = app.warm_startup()
+    log.info("startup: %s", ", ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in phases.items()))
+
+
+def when_ready(server):
+    if preload_app:
+        _warm(server.log)
+        # всё прогретое — в постоянное поколение: сборщик мусора в воркерах
+        # не обходит эти объекты и не копирует их страницы
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _warm(worker.log)
@@ -0,0 +1,29 @@
+"""
+Внешние стили (Bootstrap из dbc.themes) -> assets/vendor/ для CV_CRITICAL_PATH=1.
+
+    python vendor.py
+
+Шаг сборки/деплоя: сервер в запросе сеть не трогает и без этих файлов
+оставляет ссылку на CDN (с предупреждением при старте). Ошибка сети
+здесь — ненулевой код выхода.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+os.chdir(ROOT)  # VENDOR_DIR задан относительно корня проекта
+sys.path.insert(0, str(ROOT))
+
+import app as cv  # noqa: E402
+
+
+def main() -> None:
+    for path in cv.fetch_vendor_styles():
+        print(f"{path}: {path.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()